@@ -0,0 +1,72 @@
+"""Request body size limits enforced while the body is received.
+
+FastAPI spools multipart uploads to disk before the route runs, so a size
+check inside the route only happens after the whole upload was accepted.
+This middleware rejects oversized bodies up front (Content-Length) or as soon
+as the streamed body passes the limit.
+"""
+import json
+
+from fastapi import HTTPException
+
+# Room for the multipart boundaries and part headers around an uploaded file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class BodyLimitMiddleware:
+    """ASGI middleware limiting the request body of selected paths to a number of bytes.
+
+    Keys ending in "/" match every path under them (e.g. "/participant/submit/");
+    other keys match exactly. An exact match wins over a prefix, a longer prefix
+    over a shorter one.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+        self.prefixes = sorted((p for p in limits if p.endswith("/")), key=len, reverse=True)
+
+    def limit_for(self, path: str):
+        if path in self.limits:
+            return self.limits[path]
+        for prefix in self.prefixes:
+            if path.startswith(prefix):
+                return self.limits[prefix]
+        return None
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limit_for(scope.get("path", "")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body is larger than {limit // (1024 * 1024)} MB"
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            await _reject(send, detail)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside body parsing; FastAPI turns it into a 413 response
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def _reject(send, detail: str):
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
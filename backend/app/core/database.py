@@ -15,3 +15,4 @@ registrations_collection = database.get_collection("registrations")
 submissions_collection = database.get_collection("submissions")
 evaluations_collection = database.get_collection("evaluations")
 
+executions_collection = database.get_collection("executions")
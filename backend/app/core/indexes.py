@@ -0,0 +1,107 @@
+"""MongoDB indexes for every collection, created idempotently at startup.
+
+Run `python -m app.core.indexes --check` to create them and explain each
+registered hot query; it exits non-zero if any query still does a COLLSCAN.
+"""
+import asyncio
+import os
+import sys
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from app.core.database import (
+    executions_collection,
+    hackathon_collection,
+    registrations_collection,
+    submissions_collection,
+    user_collection,
+)
+
+# Also explain the hot queries at startup and log any collection scans
+CHECK_QUERY_PLANS = os.getenv("CHECK_QUERY_PLANS", "false").lower() in ("1", "true", "yes")
+
+INDEXES = [
+    (user_collection, [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ]),
+    # participant first, so "my registrations" uses the same index as the pair lookup
+    (registrations_collection, [
+        IndexModel([("participant_username", ASCENDING), ("hackathon_id", ASCENDING)],
+                   name="participant_hackathon_unique", unique=True),
+    ]),
+    (submissions_collection, [
+        IndexModel([("participant", ASCENDING), ("hackathon_id", ASCENDING)], name="participant_hackathon"),
+        IndexModel([("hackathon_id", ASCENDING)], name="hackathon_id"),
+        # Serve the newest-first paginated listings
+        IndexModel([("assigned_judge", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)],
+                   name="assigned_judge_submitted_at"),
+        IndexModel([("submitted_at", DESCENDING), ("_id", DESCENDING)], name="submitted_at"),
+    ]),
+    (hackathon_collection, [
+        IndexModel([("is_active", ASCENDING), ("hackathon_type", ASCENDING)], name="active_type"),
+    ]),
+    (executions_collection, [
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ]),
+]
+
+# Hot queries (with sample values) that must be served by an index
+QUERIES = [
+    (user_collection, {"username": "sample"}),
+    (user_collection, {"email": "sample@example.com"}),
+    (registrations_collection, {"hackathon_id": "sample", "participant_username": "sample"}),
+    (registrations_collection, {"participant_username": "sample"}),
+    (submissions_collection, {"hackathon_id": "sample", "participant": "sample"}),
+    (submissions_collection, {"participant": "sample"}),
+    (submissions_collection, {"hackathon_id": "sample"}),
+    (submissions_collection, {"assigned_judge": "sample"}),
+    (hackathon_collection, {"is_active": True}),
+    (hackathon_collection, {"is_active": True, "hackathon_type": "codeathon"}),
+]
+
+
+async def create_indexes():
+    """Creates the declared indexes. Existing identical indexes are left as they are."""
+    for collection, indexes in INDEXES:
+        try:
+            await collection.create_indexes(indexes)
+        except PyMongoError as e:
+            # e.g. duplicate usernames already stored, an index with the same name but other options, or no database
+            print(f"⚠️ Could not create indexes on {collection.name}: {e}")
+
+
+def _stages(plan: dict):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+async def check_query_plans() -> list:
+    """Explains every registered query; returns a description of each one that scans a collection."""
+    problems = []
+    for collection, query in QUERIES:
+        plan = await collection.find(query).explain()
+        winning = plan.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in _stages(winning):
+            problems.append(f"{collection.name} {query}: COLLSCAN")
+    return problems
+
+
+async def _main(check: bool) -> int:
+    await create_indexes()
+    if not check:
+        return 0
+    problems = await check_query_plans()
+    for problem in problems:
+        print(f"❌ {problem}")
+    print("✅ All queries use an index" if not problems else f"{len(problems)} query(ies) scan a collection")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main("--check" in sys.argv)))
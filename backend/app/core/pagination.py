@@ -0,0 +1,114 @@
+"""Keyset pagination for list endpoints.
+
+Pages are ordered by (sort_field, _id). The response body stays a plain list;
+the cursor for the next page is returned in the X-Next-Cursor header (absent on
+the last page) and passed back as `?cursor=`.
+"""
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Query, Response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page:
+    """Query parameters shared by paginated endpoints (use as a dependency)."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def encode_cursor(doc: dict, sort_field: str) -> str:
+    value = doc.get(sort_field) if sort_field != "_id" else None
+    if isinstance(value, datetime):
+        value = {"$date": value.isoformat()}
+    payload = json.dumps({"v": value, "id": str(doc["_id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Returns (sort value, ObjectId) from an opaque cursor; 400 if it was tampered with."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = payload["v"]
+        if isinstance(value, dict) and "$date" in value:
+            value = datetime.fromisoformat(value["$date"])
+        return value, ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_match(page: Page, sort_field: str = "_id", descending: bool = False) -> dict:
+    """Filter selecting the documents after the cursor ({} on the first page)."""
+    if not page.cursor:
+        return {}
+    value, last_id = decode_cursor(page.cursor)
+    op = "$lt" if descending else "$gt"
+    if sort_field == "_id":
+        return {"_id": {op: last_id}}
+    return {"$or": [
+        {sort_field: {op: value}},
+        {sort_field: value, "_id": {op: last_id}},
+    ]}
+
+
+def sort_spec(sort_field: str = "_id", descending: bool = False) -> list:
+    direction = -1 if descending else 1
+    keys = [(sort_field, direction)]
+    if sort_field != "_id":
+        keys.append(("_id", direction))
+    return keys
+
+
+def projection(fields: str, allowed) -> dict:
+    """Projection for a comma-separated `?fields=`, restricted to `allowed`; None means all fields."""
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return {f: 1 for f in requested}
+
+
+def finish_page(docs: list, page: Page, response: Response, sort_field: str = "_id") -> list:
+    """Trims the extra look-ahead document and sets X-Next-Cursor when there is a next page."""
+    if len(docs) > page.limit:
+        docs = docs[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(docs[-1], sort_field)
+    return docs
+
+
+async def paginate(collection, query: dict, page: Page, response: Response,
+                   sort_field: str = "_id", descending: bool = False, fields: dict = None) -> list:
+    """One page of `collection.find(query)` in (sort_field, _id) order."""
+    keyset = keyset_match(page, sort_field, descending)
+    if keyset:
+        query = {"$and": [query, keyset]}
+    if fields is not None:
+        # The cursor is built from these
+        fields = {**fields, sort_field: 1}
+    docs = await collection.find(query, fields) \
+        .sort(sort_spec(sort_field, descending)) \
+        .limit(page.limit + 1) \
+        .to_list(None)
+    return finish_page(docs, page, response, sort_field)
+
+
+def stringify_ids(doc: dict, *fields) -> dict:
+    for field in ("_id",) + fields:
+        if isinstance(doc.get(field), ObjectId):
+            doc[field] = str(doc[field])
+    return doc
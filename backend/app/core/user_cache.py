@@ -0,0 +1,54 @@
+import os
+import time
+from collections import OrderedDict
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 30))         # seconds a looked-up user is reused
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+
+
+class UserCache:
+    """In-process TTL + LRU cache of authenticated users, keyed by username.
+
+    Call `invalidate(username)` whenever a user document changes so the next
+    request reads it from MongoDB again (the auth routes do). Changes made
+    outside this process, e.g. disabling a user in the database or in another
+    worker, are picked up after at most USER_CACHE_TTL seconds.
+    """
+
+    def __init__(self, ttl: float = USER_CACHE_TTL, max_entries: int = USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # username -> (expires_at, user)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, username: str):
+        entry = self._entries.get(username)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(username, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(username)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, username: str, user):
+        if self.ttl <= 0:
+            return
+        self._entries[username] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, username: str):
+        self._entries.pop(username, None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+
+
+user_cache = UserCache()
+
+
+def invalidate_user(username: str):
+    user_cache.invalidate(username)
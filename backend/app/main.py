@@ -1,19 +1,74 @@
+import asyncio
 from fastapi import FastAPI
 from app.routes import auth, users, judge, participant
 from app.routes import model_evaluator
 from app.routes import hackathon
+from app.routes import health
 from fastapi.middleware.cors import CORSMiddleware
+from app.services.code_executor import warm_pools, shutdown_pools
+from app.services.job_queue import execution_jobs
+from app.services.evaluation_pool import evaluation_pool
+from app.services.model_registry import model_registry, PRELOAD_MODELS
+from app.core.indexes import create_indexes, check_query_plans, CHECK_QUERY_PLANS
+from app.core.security import CORS_ORIGINS
+from app.core.body_limit import BodyLimitMiddleware, MULTIPART_OVERHEAD_BYTES
+from app.services.judge_pipeline import recover_interrupted_evaluations
+from pymongo.errors import PyMongoError
+from app.services.pitch_scoring import MAX_PPT_UPLOAD_BYTES, MAX_PPT_BATCH_BYTES
+from app.services.uploads import MAX_UPLOAD_BYTES
 
 app = FastAPI()
+_background = set()
 
 
+async def prepare_database():
+    """Index creation and cleanup; runs in the background so an unreachable Mongo doesn't block startup."""
+    await create_indexes()
+    try:
+        recovered = await recover_interrupted_evaluations()
+        if recovered:
+            print(f"⚠️ Marked {recovered} interrupted judge evaluation(s) as failed")
+        if CHECK_QUERY_PLANS:
+            for problem in await check_query_plans():
+                print(f"⚠️ Unindexed query: {problem}")
+    except PyMongoError as e:
+        print(f"⚠️ Database startup tasks failed: {e}")
+
+
+@app.on_event("startup")
+async def startup():
+    task = asyncio.create_task(prepare_database())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    # Pre-start sandbox containers so the first runs don't pay Docker create/start
+    warm_pools()
+    await execution_jobs.start()
+    if PRELOAD_MODELS:
+        # Pitch-scoring models load in the background; requests before that load on demand
+        model_registry.preload()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await execution_jobs.stop()
+    shutdown_pools()
+    evaluation_pool.shutdown()
+
+
+# Reject oversized uploads while they arrive, not after they were spooled to disk.
+# Submissions get the largest per-type limit here; save_upload applies the exact one.
+app.add_middleware(BodyLimitMiddleware, limits={
+    "/model_evaluator/predict-ppt": MAX_PPT_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    "/model_evaluator/predict-ppt/batch": MAX_PPT_BATCH_BYTES,
+    "/participant/submit/": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+})
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5174", "http://localhost:5173"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(hackathon.router, prefix="/hackathon", tags=["Hackathon"])
@@ -22,6 +77,7 @@ app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/users", tags=["Users"])
 app.include_router(participant.router, prefix="/participant", tags=["Participant"])
 app.include_router(model_evaluator.router, prefix="/model_evaluator", tags=["Model Evaluator"])
+app.include_router(health.router, prefix="/health", tags=["Health"])
 
 @app.get("/")
 async def root():
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Annotated
+from typing import Optional, Annotated, List
 from bson import ObjectId
 from pydantic import BaseModel, Field, constr, BeforeValidator
 
@@ -11,6 +11,18 @@ class HackathonType(str, Enum):
     CODEATHON = "codeathon"
     HACKATHON = "hackathon"
 
+class EvaluationMetric(str, Enum):
+    ACCURACY = "accuracy"
+    PRECISION = "precision"
+    RECALL = "recall"
+    F1_SCORE = "f1_score"
+    PRECISION_MACRO = "precision_macro"
+    RECALL_MACRO = "recall_macro"
+    F1_MACRO = "f1_macro"
+    ROC_AUC = "roc_auc"
+    RMSE = "rmse"
+    MAE = "mae"
+
 class HackathonBase(BaseModel):
     name: str
     description: str
@@ -18,6 +30,8 @@ class HackathonBase(BaseModel):
     start_date: datetime
     end_date: datetime
     is_active: bool = True
+    # ML hackathons only; None = accuracy / precision / recall / f1_score
+    metrics: Optional[List[EvaluationMetric]] = None
 
 class HackathonCreate(HackathonBase):
     pass
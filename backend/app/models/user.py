@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Annotated
+from typing import Optional, Annotated, Union
 
 from bson import ObjectId
 from pydantic import BaseModel, Field, EmailStr, constr, BeforeValidator
@@ -21,6 +21,13 @@ class UserCreate(BaseModel):
     password: constr(min_length=8, max_length=72)
     role: UserRole 
 
+class TokenUser(BaseModel):
+    """The caller as described by verified JWT claims (no database lookup)."""
+    username: str
+    name: str
+    role: UserRole
+    disabled: bool = False
+
 class User(BaseModel):
     # Use the new PyObjectId type for the id field
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
@@ -44,4 +51,8 @@ class User(BaseModel):
                 "email": "om@example.com",
                 "role": "admin",
             }
-        }
\ No newline at end of file
+        }
+
+# What RoleChecker(..., trust_claims=True) hands to a route: the full User, or
+# only the signed claims when the token is fresh (no email, id or timestamps)
+AuthenticatedUser = Union[User, TokenUser]
@@ -1,41 +1,83 @@
+import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from jose import JWTError, jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from app.core.database import user_collection
-from app.core.security import ALGORITHM, SECRET_KEY, create_access_token, get_password_hash, verify_password
-from app.models.user import User, UserCreate, UserRole
+from app.core.security import (
+    ALGORITHM, SECRET_KEY, TRUSTED_CLAIMS_SECONDS, PasswordHasherBusy,
+    create_access_token, hash_password, verify_and_update_password,
+)
+from app.core.user_cache import user_cache, invalidate_user
+from app.models.user import AuthenticatedUser, TokenUser, User, UserCreate, UserRole
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    print("SECRET_KEY:", SECRET_KEY[:10])
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+disabled_exception = HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User account is disabled")
 
+def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = await user_collection.find_one({"username": username})
-    if user is None:
+    if payload.get("sub") is None:
         raise credentials_exception
-    
-    # Return the user as a Pydantic model
-    return User(**user)
+    return payload
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    username = decode_token(token)["sub"]
+
+    # Recently seen users are served from memory (see core/user_cache.py)
+    current_user = user_cache.get(username)
+    if current_user is None:
+        user = await user_collection.find_one({"username": username})
+        if user is None:
+            raise credentials_exception
+        # Return the user as a Pydantic model
+        current_user = User(**user)
+        user_cache.put(username, current_user)
+
+    if current_user.disabled:
+        raise disabled_exception
+    return current_user
+
+def _trusted_claims_user(payload: dict) -> Optional[TokenUser]:
+    """A TokenUser from the token's claims if they were issued recently enough to trust, else None."""
+    issued_at = payload.get("iat")
+    if not TRUSTED_CLAIMS_SECONDS or issued_at is None or "role" not in payload:
+        return None
+    if time.time() - issued_at > TRUSTED_CLAIMS_SECONDS:
+        return None
+    return TokenUser(
+        username=payload["sub"],
+        name=payload.get("name", payload["sub"]),
+        role=payload["role"],
+        disabled=payload.get("disabled", False),
+    )
+
+def RoleChecker(allowed_roles: List[UserRole], trust_claims: bool = False):
+    """Dependency allowing only `allowed_roles`.
+
+    With trust_claims=True, role checks on fresh tokens (issued within
+    TRUSTED_CLAIMS_SECONDS) use the signed JWT claims and skip MongoDB; the
+    route then receives a TokenUser (username, name, role) instead of a User,
+    so annotate it as AuthenticatedUser.
+    """
+    async def check_roles(token: str = Depends(oauth2_scheme)) -> AuthenticatedUser:
+        current_user = _trusted_claims_user(decode_token(token)) if trust_claims else None
+        if current_user is None:
+            current_user = await get_current_user(token)
+        elif current_user.disabled:
+            raise disabled_exception
 
-def RoleChecker(allowed_roles: List[UserRole]):
-    def check_roles(current_user: User = Depends(get_current_user)):
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -72,11 +114,17 @@ async def signup(user_data: UserCreate):
     if db_user_by_username:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken")
 
+    # bcrypt runs in its own bounded thread pool, off the event loop
+    try:
+        hashed_password = await hash_password(user_data.password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+
     user_document = {
         "name": user_data.name,
         "username": user_data.username,
         "email": user_data.email,
-        "hashed_password": get_password_hash(user_data.password),
+        "hashed_password": hashed_password,
         "role": user_data.role.value,
         "disabled": False,
         "created_at": datetime.utcnow(),
@@ -84,21 +132,43 @@ async def signup(user_data: UserCreate):
     }
     
     result = await user_collection.insert_one(user_document)
+    # Drop anything cached for a previous account with this username
+    invalidate_user(user_data.username)
     created_user = await user_collection.find_one({"_id": result.inserted_id})
     return created_user
 
 @router.post("/login")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     user = await user_collection.find_one({"username": form_data.username})
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_and_update_password(form_data.password, user["hashed_password"])
+        except PasswordHasherBusy as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if new_hash:
+        # Stored hash used a different bcrypt cost (BCRYPT_ROUNDS changed): upgrade it transparently
+        await user_collection.update_one(
+            {"_id": user["_id"]},
+            {"$set": {"hashed_password": new_hash, "updated_at": datetime.utcnow()}},
+        )
+        invalidate_user(user["username"])
+
     access_token = create_access_token(
-        data={"sub": user["username"], "role": user["role"]}
+        data={
+            "sub": user["username"],
+            "role": user["role"],
+            "name": user["name"],
+            "disabled": user.get("disabled", False),
+            "iat": int(time.time()),
+        }
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
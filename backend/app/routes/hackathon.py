@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException
+from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException, Response
 from datetime import datetime
 from app.models.hackathon import Hackathon, HackathonCreate
 from app.core.database import hackathon_collection, registrations_collection, submissions_collection
 from app.routes.auth import RoleChecker, get_current_user
+from app.core.pagination import Page, paginate
 from app.models.user import UserRole, User
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from fastapi import Path
 
 
@@ -32,6 +34,7 @@ async def create_hackathon(
         "start_date": hackathon_data.start_date,
         "end_date": hackathon_data.end_date,
         "is_active": hackathon_data.is_active,
+        "metrics": [m.value for m in hackathon_data.metrics] if hackathon_data.metrics else None,
         "created_by": current_user.username,
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
@@ -43,28 +46,28 @@ async def create_hackathon(
 
 # Retrieve all active hackathons (for any user)
 @router.get("/active", response_model=list[Hackathon])
-async def get_active_hackathons():
+async def get_active_hackathons(response: Response, page: Page = Depends()):
     """
-    Fetch all hackathons that are currently active.
+    Fetch hackathons that are currently active (paginated, see X-Next-Cursor).
     """
     try:
-        hackathons = await hackathon_collection.find({"is_active": True}).to_list(None)
-        return hackathons
+        return await paginate(hackathon_collection, {"is_active": True}, page, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Optional: Get hackathons by type (filter)
 @router.get("/type/{hackathon_type}", response_model=list[Hackathon])
-async def get_hackathons_by_type(hackathon_type: str):
+async def get_hackathons_by_type(hackathon_type: str, response: Response, page: Page = Depends()):
     valid_types = ["ml_hackathon", "codeathon", "hackathon"]
     if hackathon_type not in valid_types:
         raise HTTPException(status_code=400, detail="Invalid hackathon type")
 
-    hackathons = await hackathon_collection.find({
+    return await paginate(hackathon_collection, {
         "hackathon_type": hackathon_type,
         "is_active": True
-    }).to_list(None)
-    return hackathons
+    }, page, response)
 
 
 # Delete a hackathon (admin only)
@@ -131,7 +134,11 @@ async def register_for_hackathon(
         "registered_at": datetime.utcnow(),
     }
 
-    await registrations_collection.insert_one(registration)
+    try:
+        await registrations_collection.insert_one(registration)
+    except DuplicateKeyError:
+        # A concurrent request registered first (unique participant/hackathon index)
+        raise HTTPException(status_code=409, detail="Already registered for this hackathon")
     return {"message": f"{current_user.username} successfully registered for {hackathon['name']}"}
 
 @router.get("/is_registered/{hackathon_id}")
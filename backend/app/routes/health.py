@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from app.services.code_executor import executor_status
+from app.services.job_queue import execution_jobs
+from app.services.evaluation_pool import evaluation_pool
+from app.services.model_registry import model_registry
+from app.services.embedding_cache import embeddings
+from app.services.explanations import explainer
+from app.core.user_cache import user_cache
+
+router = APIRouter()
+
+@router.get("/")
+def health():
+    """
+    Readiness of the code execution sandbox and evaluation caches.
+    """
+    executor = executor_status()
+    return {
+        "status": "ok" if executor["images_ready"] else "degraded",
+        "executor": executor,
+        "execution_jobs": execution_jobs.stats(),
+        "evaluation_pool": evaluation_pool.stats(),
+        "models_ready": model_registry.ready(),
+        "models": model_registry.status(),
+        "embedding_cache": embeddings.stats(),
+        "explanations": explainer.stats(),
+        "user_cache": user_cache.stats(),
+    }
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Response, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 from app.models.hackathon import Hackathon, HackathonCreate
 from app.core.database import hackathon_collection, registrations_collection ,submissions_collection, evaluations_collection
 
 from app.routes.auth import RoleChecker, get_current_user
-from app.models.user import UserRole, User
+from app.models.user import AuthenticatedUser, UserRole, User
 from bson import ObjectId
 import os
+import json
 from fastapi import Path
 from app.routes.model_evaluator import run_model_evaluation, evaluate_model, predict_pitch, execute
+from app.routes.participant import UPLOAD_DIR
+from app.services.bulk_evaluation import start_reevaluation, bulk_runs, is_running
+from app.services.judge_pipeline import start_evaluation
+from app.services.dashboards import judge_assigned
+from app.core.pagination import Page, paginate, projection, stringify_ids
 
 import numpy as np
   
@@ -27,43 +34,68 @@ async def assign_judge(submission_id: str, judge_username: str):
 
 @router.get("/assigned")
 async def get_assigned_hackathons(
-    current_user: User = Depends(RoleChecker([UserRole.JUDGE]))
+    response: Response,
+    page: Page = Depends(),
+    fields: str = Query(None, description="Comma-separated fields to return"),
+    current_user: AuthenticatedUser = Depends(RoleChecker([UserRole.JUDGE], trust_claims=True))
 ):
-    """Fetch all hackathons or submissions assigned to this judge."""
+    """Fetch the submissions assigned to this judge, newest first (paginated)."""
     try:
-        assigned = await submissions_collection.find(
-            {"assigned_judge": current_user.username}
-        ).to_list(None)
-
-        if not assigned:
-            return []
-
-        # Convert ObjectIds -> strings
-        for sub in assigned:
-            if "_id" in sub:
-                sub["_id"] = str(sub["_id"])
-            if "hackathon_id" in sub and not isinstance(sub["hackathon_id"], str):
-                sub["hackathon_id"] = str(sub["hackathon_id"])
-
-        return assigned
+        return await judge_assigned(current_user.username, page, response, fields)
 
+    except HTTPException:
+        raise
     except Exception as e:
         print("❌ Error fetching assigned submissions:", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 import traceback
 
+SUBMISSION_EXPORT_FIELDS = (
+    "hackathon_id", "participant", "hackathon_type", "submission_filename", "github_url",
+    "submitted_at", "status", "assigned_judge", "evaluation_result", "evaluation_result_text",
+)
+
 @router.get("/submissions")
-async def get_all_submissions(current_user: User = Depends(get_current_user)):
+async def get_all_submissions(
+    response: Response,
+    page: Page = Depends(),
+    fields: str = Query(None, description="Comma-separated fields to return"),
+    current_user: User = Depends(get_current_user)
+):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Access denied")
-    subs = await submissions_collection.find().to_list(None)
-    return subs
+    subs = await paginate(
+        submissions_collection, {}, page, response,
+        sort_field="submitted_at", descending=True,
+        fields=projection(fields, SUBMISSION_EXPORT_FIELDS),
+    )
+    return [stringify_ids(sub, "hackathon_id") for sub in subs]
 
+@router.get("/submissions/export")
+async def export_submissions(current_user: User = Depends(get_current_user)):
+    """Every submission as one JSON array, streamed from the database cursor."""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    fields = {name: 1 for name in SUBMISSION_EXPORT_FIELDS}
+
+    async def rows():
+        yield "["
+        first = True
+        async for sub in submissions_collection.find({}, fields).sort("_id", 1).batch_size(500):
+            yield ("" if first else ",") + json.dumps(stringify_ids(sub, "hackathon_id"), default=str)
+            first = False
+        yield "]"
+
+    return StreamingResponse(
+        rows(),
+        media_type="application/json",
+        headers={"Content-Disposition": "attachment; filename=submissions.json"},
+    )
 
-from app.routes.model_evaluator import run_model_evaluation
 
-@router.post("/evaluate/{submission_id}")
+@router.post("/evaluate/{submission_id}", status_code=202)
 async def evaluate_submission(submission_id: str, current_user: User = Depends(get_current_user)):
     # ---- Authorization ----
     if current_user.role != UserRole.JUDGE:
@@ -76,95 +108,66 @@ async def evaluate_submission(submission_id: str, current_user: User = Depends(g
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    hack_type = submission["hackathon_type"]
-
-    # ---- Step 1: Dummy metrics ----
-    import random, asyncio
-    await asyncio.sleep(0.3)
-
-    if hack_type == "ml_hackathon":
-        evaluate_model(submission.get("submission_filename"))
-
-    elif hack_type == "codeathon":
-        file = submission.get("submission_filename")
-        
-
-    else:
-        metrics = {
-            "docker_valid": bool(random.choice([True, False])),
-            "deployment_ready": bool(random.choice([True, False])),
-            "final_score": round(random.uniform(0.6, 0.95), 2)
-        }
-
-    # ---- Step 2: Load code (only codeathon) ----
-    # ---------------------------------------------
-    code_preview = "(No code found)"
-
-    filename = submission.get("submission_filename")
-    file_path = f"uploads/{filename}" if filename else None
-
-    if file_path:
-        try:
-            # If file is text-based (py, cpp, java, txt, Dockerfile, ipynb)
-            if any(file_path.endswith(ext) for ext in [".py", ".cpp", ".java", ".txt", "Dockerfile"]):
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    code_preview = f.read()[:1500]
-
-            # If ML model (.onnx), try to find corresponding script
-            elif file_path.endswith(".onnx"): 
-                # Try to find a script with same prefix
-                base = filename.split(".")[0] 
-                for ext in [".py", ".ipynb"]: 
-                    alt = f"uploads/{base}{ext}"
-                    if os.path.exists(alt):
-                        with open(alt, "r", encoding="utf-8", errors="ignore") as f:
-                            code_preview = f.read()[:1500]
-                            break
-
-        except Exception as e:
-            code_preview = f"(Error reading code: {str(e)})"
-
-
-    # ---- Step 3: LLM explanation (Gemini) ----
-    import os, google.generativeai as genai
-    
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    model = genai.GenerativeModel("gemini-pro")
-
-    prompt = f"""
-You are an evaluator for a hackathon platform.
-
-Hackathon Type: {hack_type}
-Metrics: {metrics}
-Participant Username: {submission['participant']}
-Submitted Code Snippet: {code_preview}
-
-Write a clear human-friendly evaluation summary. Use this format:
-
-1. Overall Summary (2–3 sentences)
-2. Interpretation of Metrics
-3. Strengths (bullets)
-4. Weaknesses (bullets)
-5. Suggestions (bullets)
-"""
+    # Metrics -> code preview -> explanation -> persist run in the background
+    pipeline = await start_evaluation(submission, UPLOAD_DIR)
+    if pipeline is None:
+        raise HTTPException(status_code=409, detail="Evaluation already in progress")
+    return {"queued": True, "submission_id": submission_id, "evaluation_pipeline": pipeline}
 
-    try:
-        ai_res = model.generate_content(prompt)
-        explanation = ai_res.text
-    except Exception as e:
-        explanation = f"(Failed to generate explanation: {str(e)})"
+@router.get("/evaluate/{submission_id}/progress")
+async def evaluate_submission_progress(submission_id: str, current_user: User = Depends(get_current_user)):
+    if current_user.role not in (UserRole.JUDGE, UserRole.ADMIN):
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    if not ObjectId.is_valid(submission_id):
+        raise HTTPException(status_code=400, detail="Invalid submission ID")
 
-    # ---- Step 4: SAVE IN DB ----
-    await submissions_collection.update_one(
+    submission = await submissions_collection.find_one(
         {"_id": ObjectId(submission_id)},
-        {"$set": {
-            "status": "evaluated",
-            "evaluation_result": metrics,
-            "evaluation_result_text": explanation
-        }}
+        {"status": 1, "evaluation_pipeline": 1, "evaluation_result": 1},
     )
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    if not submission.get("evaluation_pipeline"):
+        raise HTTPException(status_code=404, detail="Submission has not been queued for evaluation")
+
+    return {
+        "submission_id": submission_id,
+        "status": submission.get("status"),
+        "evaluation_pipeline": submission["evaluation_pipeline"],
+        "result": submission.get("evaluation_result"),
+    }
 
-    return {"evaluated": True}
+# Bulk re-evaluation of every ML submission in a hackathon (e.g. new test set or deadline)
+@router.post("/evaluate_hackathon/{hackathon_id}", status_code=202)
+async def evaluate_hackathon(
+    hackathon_id: str,
+    force: bool = False,
+    current_user: User = Depends(RoleChecker([UserRole.ADMIN, UserRole.ORGANIZER, UserRole.JUDGE]))
+):
+    if not ObjectId.is_valid(hackathon_id):
+        raise HTTPException(status_code=400, detail="Invalid hackathon ID")
+
+    hackathon = await hackathon_collection.find_one({"_id": ObjectId(hackathon_id)})
+    if not hackathon:
+        raise HTTPException(status_code=404, detail="Hackathon not found")
+    if hackathon["hackathon_type"] != "ml_hackathon":
+        raise HTTPException(status_code=400, detail="Bulk evaluation is only available for ML hackathons")
+    if is_running(hackathon_id):
+        raise HTTPException(status_code=409, detail="An evaluation run is already in progress")
+
+    progress = start_reevaluation(hackathon, UPLOAD_DIR, force=force)
+    return {"message": "Evaluation started", "progress": progress}
+
+@router.get("/evaluate_hackathon/{hackathon_id}/progress")
+async def evaluate_hackathon_progress(
+    hackathon_id: str,
+    current_user: AuthenticatedUser = Depends(RoleChecker([UserRole.ADMIN, UserRole.ORGANIZER, UserRole.JUDGE], trust_claims=True))
+):
+    progress = bulk_runs.get(hackathon_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No evaluation run for this hackathon")
+    return progress
 
 @router.get("/get_result/{submission_id}")
 async def get_result(submission_id: str, current_user: User = Depends(get_current_user)):
@@ -1,157 +1,243 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, File, Form, UploadFile, HTTPException, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import pandas as pd
-import numpy as np
-from pptx import Presentation
-import re
-import joblib
-import textstat
-from sentence_transformers import SentenceTransformer
-import onnxruntime as ort
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-import tempfile, os
-from app.services.code_executor import execute_code
+from typing import List
+import tempfile, os, json, asyncio
+from app.services.code_executor import execute_code, execute_batch, stream_code
+from app.services.job_queue import execution_jobs, QueueFull
+from app.services.execution_log import record_execution
+from app.services.evaluation_pool import evaluation_pool, EvaluationTimeout
+from app.services.model_evaluation import evaluate_onnx_model
+from app.services.model_registry import model_registry
+from app.services.hidden_test_sets import validate_hackathon_id
+from app.services.pitch_scoring import extract_text_from_ppt, score_decks, DeckError, DeckTooLarge, MAX_PPT_BATCH_FILES
+from app.core.database import hackathon_collection
+from app.core.security import CORS_ORIGINS
+from app.routes.auth import get_current_user
+from bson import ObjectId
 
 router = APIRouter()
+
 class CodeRequest(BaseModel):
     language: str
     code: str
 
-TEST_DATA_PATH = r"D:\Projects\Hacklens\backend\app\routes\test.csv"
+class TestCase(BaseModel):
+    input: str = ""
+    expected_output: str = ""
 
-# ML Model for PPT evaluation
-MODEL_PATH = r"D:\Projects\Hacklens\backend\app\ml_model\pitch_model.pkl"
-model = joblib.load(MODEL_PATH)
-sbert = SentenceTransformer("all-MiniLM-L6-v2")
+class BatchCodeRequest(BaseModel):
+    language: str
+    code: str
+    test_cases: List[TestCase]
+    time_limit: float = 2.0        # seconds per case
+    memory_limit_mb: int = 256     # per case (capped by the sandbox limit)
 
 # Code execution endpoint for JAVA/ CPP/ Python
 @router.post("/execute/")
-def execute(req: CodeRequest):
-    result = execute_code(req.language, req.code)
+async def execute(req: CodeRequest):
+    result = await run_in_threadpool(execute_code, req.language, req.code)
+    await record_execution("execute", req.language, result)
     return result
 
+# Streaming execution: output is forwarded as it is produced (stdout/stderr kept separate)
+async def _websocket_user(websocket: WebSocket):
+    """The caller of a WebSocket, or None. CORS does not cover WebSocket handshakes,
+    so the Origin is checked here and the JWT is required like on the HTTP routes.
+    """
+    origin = websocket.headers.get("origin")
+    if origin is not None and origin not in CORS_ORIGINS:
+        return None
+    # Browsers cannot set headers on WebSockets, so the token may also come as ?token=
+    token = websocket.query_params.get("token")
+    authorization = websocket.headers.get("authorization", "")
+    if not token and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        return None
+    try:
+        return await get_current_user(token)
+    except HTTPException:
+        return None
+
+@router.websocket("/execute/stream")
+async def execute_stream_ws(websocket: WebSocket):
+    """Client sends {"language", "code"} once, then receives output events until "exit".
+
+    Authenticate with ?token=<JWT> (or an Authorization: Bearer header).
+    """
+    if await _websocket_user(websocket) is None:
+        # Before accept(): the handshake is refused with 403
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    try:
+        req = CodeRequest(**await websocket.receive_json())
+    except Exception as e:
+        await websocket.send_json({"type": "exit", "status": "error", "output": f"Invalid request: {e}"})
+        await websocket.close()
+        return
+
+    events = stream_code(req.language, req.code)
+    event = None
+    try:
+        async for event in iterate_in_threadpool(events):
+            await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await run_in_threadpool(events.close)
+        if event and event.get("type") == "exit":
+            await record_execution("stream", req.language, event)
+
+@router.post("/execute/stream")
+async def execute_stream_http(req: CodeRequest):
+    """Chunked HTTP variant: newline-delimited JSON events."""
+    events = stream_code(req.language, req.code)
+
+    async def lines():
+        event = None
+        try:
+            async for event in iterate_in_threadpool(events):
+                yield json.dumps(event) + "\n"
+        finally:
+            await run_in_threadpool(events.close)
+            if event and event.get("type") == "exit":
+                await record_execution("stream", req.language, event)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# Codeathon grading: compile once, run every test case in one sandbox
+@router.post("/execute/batch")
+async def execute_test_cases(req: BatchCodeRequest):
+    result = await run_in_threadpool(
+        execute_batch,
+        req.language,
+        req.code,
+        [case.model_dump() for case in req.test_cases],
+        time_limit=req.time_limit,
+        memory_limit_mb=req.memory_limit_mb,
+    )
+    await record_execution("batch", req.language, result)
+    return result
+
+# Queued code execution: enqueue, then poll or stream the job
+@router.post("/jobs", status_code=202)
+async def submit_execution_job(req: CodeRequest):
+    try:
+        job = execution_jobs.submit(req.language, req.code)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_execution_job(job_id: str):
+    job = execution_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_execution_job(job_id: str):
+    """Server-sent events: one event per status change until the job finishes."""
+    if execution_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        async for job in execution_jobs.watch(job_id):
+            yield f"data: {json.dumps(job)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 # Model Evaluator route
 @router.post("/evaluate-model")
-async def evaluate_model(file: UploadFile = File(...)):
+async def evaluate_model(file: UploadFile = File(...), hackathon_id: str = Form(None)):
     """External route version (API endpoint)."""
+    if hackathon_id:
+        try:
+            hackathon_id = validate_hackathon_id(hackathon_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".onnx") as tmp:
             contents = await file.read()
             tmp.write(contents)
             tmp_path = tmp.name
 
-        result = await run_model_evaluation(tmp_path)
+        result = await run_model_evaluation(tmp_path, hackathon_id)
         os.remove(tmp_path)
         return JSONResponse(content=result)
+    except EvaluationTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Helper for model evaluator
-async def run_model_evaluation(file_path: str) -> dict:
+async def run_model_evaluation(file_path: str, hackathon_id: str = None, metrics: list = None) -> dict:
     """Reusable internal function to evaluate ONNX models from file path."""
-    if not os.path.exists(TEST_DATA_PATH):
-        raise FileNotFoundError("Missing test data CSV at TEST_DATA_PATH.")
-
-    df = pd.read_csv(TEST_DATA_PATH)
-    X_test = df.drop(columns=["target"])
-    y_test = df["target"].values
-
-    sess = ort.InferenceSession(file_path, providers=["CPUExecutionProvider"])
-    input_name = sess.get_inputs()[0].name
-    output_name = sess.get_outputs()[0].name
+    # Organizers can pick the metrics per hackathon (hackathon["metrics"])
+    if metrics is None and hackathon_id and ObjectId.is_valid(hackathon_id):
+        hackathon = await hackathon_collection.find_one({"_id": ObjectId(hackathon_id)}, {"metrics": 1})
+        metrics = (hackathon or {}).get("metrics")
 
-    X_input = X_test.astype(np.float32)
-    y_pred = sess.run([output_name], {input_name: X_input.values})[0]
-    y_pred = np.argmax(y_pred, axis=1) if y_pred.ndim > 1 else y_pred
-
-    accuracy = accuracy_score(y_test, y_pred)
-    precision = precision_score(y_test, y_pred, average='weighted', zero_division=0)
-    recall = recall_score(y_test, y_pred, average='weighted', zero_division=0)
-    f1 = f1_score(y_test, y_pred, average='weighted', zero_division=0)
-
-    return {
-        "accuracy": accuracy,
-        "precision": precision,
-        "recall": recall,
-        "f1_score": f1,
-        "final_combined_score": (
-            0.4 * accuracy + 0.2 * precision + 0.2 * recall + 0.2 * f1
-        ),
-    }
+    # CPU-heavy part runs in a worker process (see services/evaluation_pool.py)
+    return await evaluation_pool.run(evaluate_onnx_model, file_path, hackathon_id, metrics)
 
 
 # PPT Pitch Deck Evaluation Endpoint
 @router.post("/predict-ppt")
 async def predict_pitch(file: UploadFile = File(...)):
     try:
-        # Save uploaded PPT temporarily
-        temp_path = f"temp_{file.filename}"
-        with open(temp_path, "wb") as f:
-            f.write(await file.read())
-
-        # Extract features
-        X, text = extract_features_from_ppt(temp_path)
-
-        # Predict score
-        score_10 = float(model.predict(X)[0])
-        score_100 = round(score_10 * 10, 2)
-
-        # Generate simple feedback (rule-based)
-        feedback = []
-        if "problem" not in text.lower():
-            feedback.append("Add a clear 'Problem Statement' section.")
-        if "solution" not in text.lower():
-            feedback.append("Include a concise 'Solution' slide.")
-        if "tech" not in text.lower():
-            feedback.append("Describe your technology stack clearly.")
-        if "future" not in text.lower():
-            feedback.append("Mention the 'Future Scope' or roadmap.")
-        if "demo" not in text.lower():
-            feedback.append("Add a demo/prototype explanation slide.")
-
-        os.remove(temp_path)
-
-        return JSONResponse({
-            "score_out_of_10": round(score_10, 2),
-            "score_out_of_100": score_100,
-            "feedback": feedback if feedback else ["Looks well-balanced! Great job."]
-        })
+        # Models are loaded on first use (off the event loop) and shared afterwards
+        await run_in_threadpool(model_registry.get, "pitch_model")
+        await run_in_threadpool(model_registry.get, "sbert")
+
+        # Extract text straight from the spooled upload, then embed and predict score
+        deck = await run_in_threadpool(extract_text_from_ppt, file.file)
+        result = (await run_in_threadpool(score_decks, [deck]))[0]
 
+        return JSONResponse(result)
+
+    except DeckTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    except DeckError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
     except Exception as e:
         return JSONResponse({"error": str(e)}, status_code=500)
 
 
-# PPT Evaluation Helpers
-def extract_features_from_ppt(file_path):
-    prs = Presentation(file_path)
-    slide_count = len(prs.slides)
-
-    all_text = []
-    for slide in prs.slides:
-        for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text.strip():
-                all_text.append(shape.text.strip())
-    joined_text = " ".join(all_text)
-
-    word_count = len(joined_text.split())
-    avg_words_per_slide = word_count / slide_count if slide_count else 0
-    readability = textstat.flesch_reading_ease(joined_text)
-
-    keywords = {
-        "has_problem": int(bool(re.search(r"problem", joined_text, re.I))),
-        "has_solution": int(bool(re.search(r"solution", joined_text, re.I))),
-        "has_tech": int(bool(re.search(r"tech|technology|stack", joined_text, re.I))),
-        "has_future": int(bool(re.search(r"future|scope|next", joined_text, re.I))),
-        "has_demo": int(bool(re.search(r"demo|prototype|working", joined_text, re.I))),
-    }
-
-    embedding = sbert.encode(joined_text)
-    features = [
-        slide_count, word_count, avg_words_per_slide, readability,
-        keywords["has_problem"], keywords["has_solution"], keywords["has_tech"],
-        keywords["has_future"], keywords["has_demo"]
-    ] + embedding.tolist()
-
-    return np.array(features).reshape(1, -1), joined_text
+# Judging day: score every team's deck in one request
+@router.post("/predict-ppt/batch")
+async def predict_pitch_batch(files: List[UploadFile] = File(...)):
+    if len(files) > MAX_PPT_BATCH_FILES:
+        return JSONResponse(
+            {"error": f"At most {MAX_PPT_BATCH_FILES} decks per request (got {len(files)})"},
+            status_code=413,
+        )
+    try:
+        await run_in_threadpool(model_registry.get, "pitch_model")
+        await run_in_threadpool(model_registry.get, "sbert")
+
+        # Extract text from all decks concurrently
+        extracted = await asyncio.gather(
+            *(run_in_threadpool(extract_text_from_ppt, f.file) for f in files),
+            return_exceptions=True,
+        )
+        decks = [deck for deck in extracted if not isinstance(deck, Exception)]
+
+        # One batched encode + one predict over the stacked features
+        scores = iter(await run_in_threadpool(score_decks, decks))
+
+        results = []
+        for f, deck in zip(files, extracted):
+            if isinstance(deck, Exception):
+                results.append({"filename": f.filename, "error": f"Could not read deck: {deck}"})
+            else:
+                results.append({"filename": f.filename, **next(scores)})
+        return JSONResponse({"results": results})
+
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
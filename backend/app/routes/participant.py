@@ -1,26 +1,32 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Response, Query
 from datetime import datetime
 from bson import ObjectId
-from bson.errors import InvalidId
 import os
 from app.routes.auth import get_current_user
 from app.models.user import User, UserRole
-from app.core.database import hackathon_collection, submissions_collection, registrations_collection
+from app.core.database import hackathon_collection, submissions_collection
+from app.services.dashboards import participant_hackathons, participant_submissions
+from app.core.pagination import Page
+from app.services.uploads import save_upload, upload_limit, UploadTooLarge
 
 router = APIRouter()
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.get("/submissions")
-async def get_user_submissions(current_user: User = Depends(get_current_user)):
+async def get_user_submissions(
+    response: Response,
+    page: Page = Depends(),
+    fields: str = Query(None, description="Comma-separated fields to return"),
+    current_user: User = Depends(get_current_user)
+):
     """
-    Fetch all submissions made by the logged-in participant.
+    Fetch the logged-in participant's submissions, newest first (paginated).
     """
     try:
-        subs = await submissions_collection.find(
-            {"participant": current_user.username}
-        ).to_list(None)
-        return subs
+        return await participant_submissions(current_user.username, page, response, fields)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -32,44 +38,8 @@ async def get_participant_hackathons(current_user: User = Depends(get_current_us
     and attach submission details if available.
     """
     try:
-        # Step 1: Find registrations for the user
-        regs = await registrations_collection.find(
-            {"participant_username": current_user.username}
-        ).to_list(None)
-
-        if not regs:
-            return []
-
-        # Step 2: Gather hackathon IDs safely
-        hackathon_ids = []
-        for r in regs:
-            try:
-                hackathon_ids.append(ObjectId(r["hackathon_id"]))
-            except InvalidId:
-                print(f"⚠️ Invalid hackathon_id in registration: {r['hackathon_id']}")
-
-        # Step 3: Fetch hackathon details
-        hacks = await hackathon_collection.find(
-            {"_id": {"$in": hackathon_ids}}
-        ).to_list(None)
-
-        # Step 4: Attach submissions if present
-        for hack in hacks:
-            hack_id_str = str(hack["_id"])
-            sub = await submissions_collection.find_one({
-                "hackathon_id": hack_id_str,
-                "participant": current_user.username
-            })
-            if sub:
-                sub["_id"] = str(sub["_id"])
-                sub["hackathon_id"] = str(sub["hackathon_id"])
-                hack["submission"] = sub
-
-        # Step 5: Convert all ObjectIds to strings
-        for hack in hacks:
-            hack["_id"] = str(hack["_id"])
-
-        return hacks
+        # Registrations -> hackathons -> submission, joined server-side in one round trip
+        return await participant_hackathons(current_user.username)
 
     except Exception as e:
         print("❌ Error in /participant/hackathons:", e)
@@ -106,26 +76,29 @@ async def submit_project(
         raise HTTPException(status_code=400, detail="You already submitted for this hackathon")
 
     filename = None
-
-    # Handle file saving
-    if model_file:
-        filename = f"{current_user.username}_{model_file.filename}"
-        with open(os.path.join(UPLOAD_DIR, filename), "wb") as f:
-            f.write(await model_file.read())
-    elif code_file:
-        filename = f"{current_user.username}_{code_file.filename}"
-        with open(os.path.join(UPLOAD_DIR, filename), "wb") as f:
-            f.write(await code_file.read())
-    elif dockerfile:
-        filename = f"{current_user.username}_Dockerfile"
-        with open(os.path.join(UPLOAD_DIR, filename), "wb") as f:
-            f.write(await dockerfile.read())
+    file_size, file_sha256 = None, None
+
+    # Handle file saving: streamed to disk in chunks, size-limited per hackathon type
+    upload = model_file or code_file or dockerfile
+    if upload:
+        if upload is dockerfile:
+            filename = f"{current_user.username}_Dockerfile"
+        else:
+            filename = f"{current_user.username}_{os.path.basename(upload.filename)}"
+        try:
+            file_size, file_sha256 = await save_upload(
+                upload, os.path.join(UPLOAD_DIR, filename), upload_limit(hackathon["hackathon_type"])
+            )
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
     submission = {
         "hackathon_id": hackathon_id,
         "participant": current_user.username,
         "hackathon_type": hackathon_type,
         "submission_filename": filename,
+        "submission_size": file_size,
+        "submission_sha256": file_sha256,
         "github_url": github_url,
         "submitted_at": datetime.utcnow(),
         "status": "submitted",
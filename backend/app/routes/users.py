@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends
-from app.models.user import User, UserRole
+from app.models.user import AuthenticatedUser, User, UserRole
 from .auth import get_current_user, RoleChecker
 
 router = APIRouter()
@@ -13,7 +13,7 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 
 @router.get("/participant-dashboard", response_model=dict)
 async def get_participant_dashboard(
-    current_user: User = Depends(RoleChecker([UserRole.PARTICIPANT]))
+    current_user: AuthenticatedUser = Depends(RoleChecker([UserRole.PARTICIPANT], trust_claims=True))
 ):
     """
     Example of an endpoint protected for Participants only.
@@ -22,7 +22,7 @@ async def get_participant_dashboard(
 
 @router.get("/judge-dashboard", response_model=dict)
 async def get_judge_dashboard(
-    current_user: User = Depends(RoleChecker([UserRole.JUDGE]))
+    current_user: AuthenticatedUser = Depends(RoleChecker([UserRole.JUDGE], trust_claims=True))
 ):
     """
     Example of an endpoint protected for Judges only.
@@ -31,7 +31,7 @@ async def get_judge_dashboard(
 
 @router.get("/admin-panel", response_model=dict)
 async def get_admin_panel(
-    current_user: User = Depends(RoleChecker([UserRole.ADMIN, UserRole.ORGANIZER]))
+    current_user: AuthenticatedUser = Depends(RoleChecker([UserRole.ADMIN, UserRole.ORGANIZER], trust_claims=True))
 ):
     """
     Example of an endpoint protected for Admins or Organizers.
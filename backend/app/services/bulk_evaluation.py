@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import os
+from datetime import datetime
+
+from pymongo import UpdateOne
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import submissions_collection
+from app.services.evaluation_pool import EvaluationCrashed, evaluation_pool
+from app.services.model_evaluation import evaluate_onnx_model
+from app.services.onnx_sessions import file_sha256
+from app.services.hidden_test_sets import dataset_fingerprint
+
+BULK_WRITE_BATCH = 100
+# A crashed worker may be transient (e.g. memory pressure from the other jobs), so retry once
+CRASH_RETRIES = 1
+
+# hackathon_id -> progress of the latest bulk run (in-process)
+bulk_runs = {}
+_tasks = set()
+
+
+def evaluation_hash(model_hash: str, data_fingerprint: str, metrics) -> str:
+    """Changes when the model, the hidden test set or the chosen metrics change."""
+    stamp = "|".join([model_hash, data_fingerprint or "", ",".join(sorted(metrics or []))])
+    return hashlib.sha256(stamp.encode("utf-8")).hexdigest()
+
+
+def is_running(hackathon_id: str) -> bool:
+    return bulk_runs.get(hackathon_id, {}).get("status") == "running"
+
+
+def start_reevaluation(hackathon: dict, upload_dir: str, force: bool = False) -> dict:
+    """Starts a background bulk run for the hackathon and returns its progress record."""
+    hackathon_id = str(hackathon["_id"])
+    progress = {
+        "status": "running",
+        "total": 0,
+        "skipped": 0,
+        "evaluated": 0,
+        "failed": 0,
+        "retried": 0,
+        "started_at": datetime.utcnow().isoformat(),
+        "finished_at": None,
+    }
+    bulk_runs[hackathon_id] = progress
+
+    task = asyncio.create_task(reevaluate_hackathon(hackathon, upload_dir, progress, force))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return progress
+
+
+async def reevaluate_hackathon(hackathon: dict, upload_dir: str, progress: dict, force: bool = False):
+    """Scores every .onnx submission of a hackathon in parallel and bulk-writes the results.
+
+    Submissions whose model, test set and metrics are unchanged since their last
+    evaluation are skipped unless `force` is set.
+    """
+    hackathon_id = str(hackathon["_id"])
+    metrics = hackathon.get("metrics")
+
+    try:
+        subs = await submissions_collection.find(
+            {"hackathon_id": hackathon_id, "submission_filename": {"$regex": r"\.onnx$"}},
+            {"submission_filename": 1, "submission_sha256": 1, "evaluation_hash": 1},
+        ).to_list(None)
+        progress["total"] = len(subs)
+        data_fingerprint = dataset_fingerprint(hackathon_id)
+
+        # 1️⃣ Work out which submissions actually changed
+        pending = []
+        for sub in subs:
+            path = os.path.join(upload_dir, sub["submission_filename"])
+            if not os.path.exists(path):
+                progress["failed"] += 1
+                continue
+            # Hash recorded at upload time; older submissions are hashed from disk
+            model_hash = sub.get("submission_sha256") or await run_in_threadpool(file_sha256, path)
+            new_hash = evaluation_hash(model_hash, data_fingerprint, metrics)
+            if not force and sub.get("evaluation_hash") == new_hash:
+                progress["skipped"] += 1
+                continue
+            pending.append((sub["_id"], path, new_hash))
+
+        # 2️⃣ Score in parallel (bounded by the evaluation pool) and write in batches
+        limit = asyncio.Semaphore(evaluation_pool.workers)
+        updates = []
+
+        async def score(sub_id, path, new_hash):
+            async with limit:
+                for attempt in range(CRASH_RETRIES + 1):
+                    try:
+                        result = await evaluation_pool.run(evaluate_onnx_model, path, hackathon_id, metrics)
+                        break
+                    except EvaluationCrashed as e:
+                        if attempt < CRASH_RETRIES:
+                            progress["retried"] += 1
+                            continue
+                        progress["failed"] += 1
+                        return UpdateOne({"_id": sub_id}, {"$set": {"evaluation_error": str(e)}})
+                    except Exception as e:
+                        progress["failed"] += 1
+                        return UpdateOne({"_id": sub_id}, {"$set": {"evaluation_error": str(e)}})
+            progress["evaluated"] += 1
+            return UpdateOne({"_id": sub_id}, {"$set": {
+                "status": "evaluated",
+                "evaluation_result": result,
+                "evaluation_hash": new_hash,
+                "evaluation_error": None,
+                "evaluated_at": datetime.utcnow(),
+            }})
+
+        for next_update in asyncio.as_completed([score(*item) for item in pending]):
+            updates.append(await next_update)
+            if len(updates) >= BULK_WRITE_BATCH:
+                await submissions_collection.bulk_write(updates, ordered=False)
+                updates = []
+        if updates:
+            await submissions_collection.bulk_write(updates, ordered=False)
+
+        progress["status"] = "finished"
+    except Exception as e:
+        progress["status"] = "failed"
+        progress["error"] = str(e)
+    finally:
+        progress["finished_at"] = datetime.utcnow().isoformat()
@@ -1,56 +1,315 @@
+import codecs
 import docker
 import io
+import os
 import tarfile
+import threading
+import time
 import uuid
+from contextlib import contextmanager
+
+from app.services.compile_cache import CompileCache
+from app.services.container_pool import ContainerPool, SANDBOX_ENV, SANDBOX_USER
+from app.services.image_cache import ImageCache
 
 client = docker.from_env()
 
+EXEC_TIMEOUT = int(os.getenv("EXECUTOR_TIMEOUT", 20))
+COMPILE_TIMEOUT = int(os.getenv("EXECUTOR_COMPILE_TIMEOUT", 30))
+TIMEOUT_EXIT_CODE = 124  # exit status of coreutils `timeout` when the limit is hit
+KILLED_EXIT_CODE = 137   # SIGKILL (`timeout -k` escalation or OOM)
+
+# Batch (test-case) runs
+MAX_TEST_CASES = int(os.getenv("EXECUTOR_MAX_TEST_CASES", 200))
+MAX_CASE_OUTPUT = 2000  # chars of stdout/stderr echoed back per case
+
+# Output is read incrementally; a run that prints more than this is killed
+MAX_OUTPUT_BYTES = int(os.getenv("EXECUTOR_MAX_OUTPUT_BYTES", 1024 * 1024))
+
+def _ulimit(mem_mb):
+    return f"ulimit -v {mem_mb * 1024}; " if mem_mb else ""
+
+
+# "compile" writes its output to the fixed "artifact" path under /code so
+# compiled artifacts can be cached and re-injected (see compile_cache.py).
 LANGS = {
     "python": {
         "image": "python:3.10-slim",
         "ext": ".py",
         "filename": None,  # auto-generated
         "classname": None,
-        "cmd": lambda name: f"python3 /code/{name}.py"
+        "compile": None,
+        "artifact": None,
+        "run": lambda name, mem_mb=None: f"{_ulimit(mem_mb)}exec python3 /code/{name}.py"
     },
     "ml_python": {
         "image": "hacklens-ml-env:latest", # Reference the image name from docker-compose
         "ext": ".py",
         "filename": None,
         "classname": None,
-        "cmd": lambda name: f"python3 /code/{name}.py"
+        "compile": None,
+        "artifact": None,
+        "run": lambda name, mem_mb=None: f"{_ulimit(mem_mb)}exec python3 /code/{name}.py"
     },
     "cpp": {
         "image": "gcc:latest",
         "ext": ".cpp",
         "filename": None,
         "classname": None,
-        "cmd": lambda name: f"bash -c 'g++ /code/{name}.cpp -o /code/{name} && /code/{name}'"
+        "compile": lambda name: f"g++ /code/{name}.cpp -o /code/main",
+        "artifact": "main",
+        "run": lambda _, mem_mb=None: f"{_ulimit(mem_mb)}exec /code/main"
     },
     "java": {
         "image": "eclipse-temurin:17-jdk",
         "ext": ".java",
         "filename": "Main.java",       # Fixed for Java
         "classname": "Main",
-        "cmd": lambda _: "bash -c 'javac /code/Main.java && java -cp /code Main'"
+        "compile": lambda _: "javac -d /code/classes /code/Main.java",
+        "artifact": "classes",
+        # The JVM reserves far more virtual memory than it uses, so cap the heap instead of ulimit -v
+        "run": lambda _, mem_mb=None: f"exec java {f'-Xmx{mem_mb}m ' if mem_mb else ''}-cp /code/classes Main"
     }
 }
 
 
 def _make_tar_bytes(filename: str, content: str) -> bytes:
     """Creates an in-memory tar archive containing a single file (for Docker put_archive)."""
-    file_data = content.encode("utf-8")
+    return _make_tar({filename: content})
+
+
+def _make_tar(files: dict) -> bytes:
+    """Creates an in-memory tar archive from {path: text} (for Docker put_archive)."""
     tar_stream = io.BytesIO()
 
     with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-        info = tarfile.TarInfo(filename)
-        info.size = len(file_data)
-        tar.addfile(info, io.BytesIO(file_data))
+        for filename, content in files.items():
+            file_data = content.encode("utf-8")
+            info = tarfile.TarInfo(filename)
+            info.size = len(file_data)
+            tar.addfile(info, io.BytesIO(file_data))
 
     tar_stream.seek(0)
     return tar_stream.read()
 
 
+def _source_names(cfg: dict):
+    """Returns (filename, name without extension) for a new source file."""
+    if cfg["filename"]:
+        # Java case → always Main.java
+        return cfg["filename"], cfg["classname"]
+    # Python / C++ → unique filename
+    base = str(uuid.uuid4()).replace("-", "")
+    return f"{base}{cfg['ext']}", base
+
+
+def _same_output(actual: str, expected: str) -> bool:
+    """Compares outputs ignoring trailing whitespace on each line and trailing blank lines."""
+    def normalize(text):
+        return [line.rstrip() for line in text.rstrip().splitlines()]
+    return normalize(actual) == normalize(expected)
+
+
+# Image IDs resolved once, refreshed in the background
+images = ImageCache(client, sorted({cfg["image"] for cfg in LANGS.values()}))
+
+# Compiled cpp/java artifacts, keyed by image + source hash (created on first compile)
+_compile_cache = None
+_compile_cache_lock = threading.Lock()
+
+
+def get_compile_cache() -> CompileCache:
+    global _compile_cache
+    with _compile_cache_lock:
+        if _compile_cache is None:
+            _compile_cache = CompileCache()
+        return _compile_cache
+
+# One warm container pool per language
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(language: str) -> ContainerPool:
+    with _pools_lock:
+        if language not in _pools:
+            _pools[language] = ContainerPool(client, LANGS[language]["image"], images)
+        return _pools[language]
+
+
+def warm_pools():
+    """Resolves sandbox images and pre-starts containers for every language in the background."""
+    images.start()
+    for language in LANGS:
+        get_pool(language).fill()   # creates the containers on background threads
+
+
+def shutdown_pools():
+    images.stop()
+    for pool in _pools.values():
+        pool.close()
+
+
+def executor_status() -> dict:
+    return {
+        "images_ready": images.ready(),
+        "images": images.status(),
+        "pools": {language: pool.stats() for language, pool in _pools.items()},
+        "compile_cache": _compile_cache.stats() if _compile_cache else None,
+    }
+
+
+def _exec_start(container, cmd):
+    """Starts `cmd` in the sandbox; returns (exec_id, iterator of (stdout, stderr) chunks)."""
+    exec_id = client.api.exec_create(
+        container.id, cmd, workdir="/code", user=SANDBOX_USER, environment=SANDBOX_ENV
+    )["Id"]
+    return exec_id, client.api.exec_start(exec_id, stream=True, demux=True)
+
+
+def _exec_exit_code(exec_id):
+    return client.api.exec_inspect(exec_id).get("ExitCode")
+
+
+def _exec_capture(container, cmd, max_bytes: int = MAX_OUTPUT_BYTES):
+    """Runs `cmd`, keeping at most `max_bytes` of output in memory.
+
+    If the program prints more than that, the container is killed (the caller
+    must not reuse it). Returns (exit_code, stdout, stderr, truncated).
+    """
+    exec_id, chunks = _exec_start(container, cmd)
+    buffers = {"stdout": bytearray(), "stderr": bytearray()}
+    total = 0
+
+    for out, err in chunks:
+        for name, data in (("stdout", out), ("stderr", err)):
+            if not data:
+                continue
+            buffers[name] += data[:max(0, max_bytes - total)]
+            total += len(data)
+        if total > max_bytes:
+            container.kill()
+            chunks.close()
+            break
+
+    truncated = total > max_bytes
+    exit_code = None if truncated else _exec_exit_code(exec_id)
+    return (
+        exit_code,
+        buffers["stdout"].decode("utf-8", errors="replace"),
+        buffers["stderr"].decode("utf-8", errors="replace"),
+        truncated,
+    )
+
+
+# Reads CPU time, peak memory and OOM kills from the sandbox's cgroup (v2, falling back to v1)
+CGROUP_USAGE_CMD = [
+    "sh", "-c",
+    "cd /sys/fs/cgroup 2>/dev/null || exit 0; "
+    "if [ -f cpu.stat ]; then "
+    "grep '^usage_usec ' cpu.stat; grep '^oom_kill ' memory.events; "
+    # memory.peak needs Linux 5.19+; leave it out (reported as null) rather than report 0
+    "[ -f memory.peak ] && echo peak $(cat memory.peak); "
+    "else "
+    "echo usage_usec $(( $(cat cpuacct/cpuacct.usage) / 1000 )); "
+    "[ -f memory/memory.max_usage_in_bytes ] && echo peak $(cat memory/memory.max_usage_in_bytes); "
+    "grep '^oom_kill ' memory/memory.oom_control; "
+    "fi"
+]
+
+
+def _cgroup_usage(container):
+    """Returns {"usage_usec", "peak", "oom_kill"} for the container, or None if unavailable."""
+    try:
+        exit_code, output = container.exec_run(CGROUP_USAGE_CMD)
+    except Exception:
+        return None
+    usage = {}
+    for line in (output or b"").decode("utf-8", errors="replace").splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1].isdigit():
+            usage[parts[0]] = int(parts[1])
+    return usage or None
+
+
+class RunMetrics:
+    """Per-run accounting: wall time of each phase plus sandbox CPU, peak memory and OOM."""
+
+    def __init__(self):
+        self.timings = {}
+        self.compile_cached = None
+        self.exit_code = None
+        self.usage = None
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    def set_usage(self, before, after):
+        self.usage = _usage_delta(before, after)
+
+    def to_dict(self) -> dict:
+        return {
+            "timings_ms": self.timings,
+            "total_ms": round(sum(self.timings.values()), 2),
+            "compile_cached": self.compile_cached,
+            "exit_code": self.exit_code,
+            "usage": self.usage,
+        }
+
+
+def _usage_delta(before, after):
+    """CPU time used between two cgroup readings, the peak memory and whether the OOM killer fired.
+
+    Peak memory is the container's peak, so it includes compilation when the sandbox was fresh.
+    It is None when the kernel does not expose it.
+    """
+    if not before or not after:
+        return None
+    oom_killed = after.get("oom_kill", 0) > before.get("oom_kill", 0)
+    return {
+        "cpu_ms": round((after.get("usage_usec", 0) - before.get("usage_usec", 0)) / 1000, 2),
+        "peak_memory_bytes": after.get("peak"),
+        "oom_killed": oom_killed,
+    }
+
+
+def _compile(container, language: str, name_without_ext: str, code: str):
+    """Compiles the uploaded source, or injects a cached artifact on a hit.
+
+    Returns (ok, compiler output, cache_hit).
+    """
+    cfg = LANGS[language]
+    if not cfg["compile"]:
+        return True, "", False
+
+    key = CompileCache.key(images.ensure(cfg["image"]), language, code)
+    compile_cache = get_compile_cache()
+    cached = compile_cache.get(key)
+    if cached is not None:
+        container.put_archive("/code", cached)
+        return True, "", True
+
+    exit_code, (out, err) = container.exec_run(
+        ["timeout", "-k", "1", str(COMPILE_TIMEOUT), "sh", "-c", cfg["compile"](name_without_ext)],
+        workdir="/code", demux=True, user=SANDBOX_USER, environment=SANDBOX_ENV
+    )
+    output = ((out or b"") + (err or b"")).decode("utf-8", errors="replace")
+    if exit_code != 0:
+        return False, output, False
+
+    try:
+        stream, _ = container.get_archive(f"/code/{cfg['artifact']}")
+        compile_cache.put(key, b"".join(stream))
+    except Exception as e:
+        print(f"⚠️ Could not cache compiled artifact for {language}: {e}")
+    return True, output, False
+
+
 def execute_code(language: str, code: str):
     language = language.lower()
 
@@ -58,62 +317,277 @@ def execute_code(language: str, code: str):
         return {"status": "error", "output": f"Unsupported language: {language}"}
 
     cfg = LANGS[language]
+    pool = get_pool(language)
     container = None
+    healthy = False
+    metrics = RunMetrics()
+    result = {"status": "error", "output": ""}
 
     # Generate filename
-    if cfg["filename"]:
-        # Java case → always Main.java
-        filename = cfg["filename"]
-        name_without_ext = cfg["classname"]
-    else:
-        # Python / C++ → unique filename
-        base = str(uuid.uuid4()).replace("-", "")
-        filename = f"{base}{cfg['ext']}"
-        name_without_ext = base
+    filename, name_without_ext = _source_names(cfg)
 
     try:
-        # Ensure the image is available locally; try to pull if missing
-        try:
-            client.images.pull(cfg["image"])
-        except Exception:
-            # If pull fails, continue and let container.create raise a descriptive error
-            pass
-
-        # 1️⃣ Create container
-        container = client.containers.create(
-            image=cfg["image"],
-            command=cfg["cmd"](name_without_ext),
-            working_dir="/code",
-            network_disabled=True,      # safe environment
-            mem_limit="256m",
-            detach=True
-        )
+        # 1️⃣ Take a warm container from the pool
+        with metrics.phase("acquire"):
+            container = pool.acquire()
 
         # 2️⃣ Upload code into container
-        tar_bytes = _make_tar_bytes(filename, code)
-        container.put_archive("/code", tar_bytes)
+        with metrics.phase("upload"):
+            tar_bytes = _make_tar_bytes(filename, code)
+            container.put_archive("/code", tar_bytes)
 
-        # 3️⃣ Run container
-        container.start()
+        # 3️⃣ Compile (cpp / java), reusing cached artifacts
+        with metrics.phase("compile"):
+            ok, compile_output, compile_cached = _compile(container, language, name_without_ext, code)
+        metrics.compile_cached = compile_cached
+        if not ok:
+            healthy = True
+            result = {"status": "error", "output": compile_output}
+            return result
 
-        # 4️⃣ Wait for execution
-        result = container.wait(timeout=20)
-        exit_code = result.get("StatusCode", 1)
+        # 4️⃣ Run (bounded by `timeout` inside the sandbox), reading output as it arrives
+        before = _cgroup_usage(container)
+        with metrics.phase("run"):
+            exit_code, stdout, stderr, truncated = _exec_capture(
+                container,
+                ["timeout", "-k", "1", str(EXEC_TIMEOUT), "sh", "-c", cfg["run"](name_without_ext)]
+            )
+        healthy = not truncated
+        metrics.exit_code = exit_code
+        if not truncated:
+            with metrics.phase("stats"):
+                metrics.set_usage(before, _cgroup_usage(container))
 
-        # 5️⃣ Read logs
-        logs = container.logs().decode("utf-8")
+        # 5️⃣ Read output
+        logs = stdout + stderr
 
-        if exit_code == 0:
-            return {"status": "success", "output": logs}
+        if truncated:
+            result = {"status": "error", "output": logs + f"\nOutput limit exceeded ({MAX_OUTPUT_BYTES} bytes)"}
+        elif exit_code == TIMEOUT_EXIT_CODE:
+            result = {"status": "error", "output": logs + f"\nTime limit exceeded ({EXEC_TIMEOUT}s)"}
+        elif exit_code == 0:
+            result = {"status": "success", "output": logs}
         else:
-            return {"status": "error", "output": logs}
+            result = {"status": "error", "output": logs}
+        return result
+
+    except Exception as e:
+        result = {"status": "error", "output": str(e)}
+        return result
+
+    finally:
+        # 6️⃣ Hand the container back (reset for reuse or recycled in the background)
+        if container:
+            with metrics.phase("release"):
+                pool.release(container, healthy=healthy)
+        result["metrics"] = metrics.to_dict()
+
+
+def execute_batch(language: str, code: str, test_cases: list, time_limit: float = 2.0, memory_limit_mb: int = 256):
+    """Compiles once and runs every test case inside a single sandbox.
+
+    `test_cases` is a list of {"input": str, "expected_output": str}. Each case gets
+    its own time and memory limit, a verdict (AC, WA, TLE or RE) and its CPU/memory usage.
+    """
+    language = language.lower()
+
+    if language not in LANGS:
+        return {"status": "error", "output": f"Unsupported language: {language}", "results": []}
+    if len(test_cases) > MAX_TEST_CASES:
+        return {"status": "error", "output": f"Too many test cases (max {MAX_TEST_CASES})", "results": []}
+
+    cfg = LANGS[language]
+    pool = get_pool(language)
+    container = None
+    healthy = False
+    metrics = RunMetrics()
+    result = {"status": "error", "output": "", "results": []}
+    filename, name_without_ext = _source_names(cfg)
+    time_limit = min(max(time_limit, 0.1), EXEC_TIMEOUT)
+    memory_limit_mb = max(memory_limit_mb, 16)
+
+    try:
+        with metrics.phase("acquire"):
+            container = pool.acquire()
+
+        # 1️⃣ Upload the source and every input in one archive
+        with metrics.phase("upload"):
+            files = {filename: code}
+            for i, case in enumerate(test_cases):
+                files[f"tests/{i}.in"] = case.get("input") or ""
+            container.put_archive("/code", _make_tar(files))
+
+        # 2️⃣ Compile once (or reuse a cached build)
+        with metrics.phase("compile"):
+            ok, compile_output, compile_cached = _compile(container, language, name_without_ext, code)
+        metrics.compile_cached = compile_cached
+        if not ok:
+            healthy = True
+            result = {"status": "compile_error", "output": compile_output, "results": []}
+            return result
+
+        # 3️⃣ Run each case against the compiled program
+        run_cmd = cfg["run"](name_without_ext, memory_limit_mb)
+        results = []
+        output_limit_hit = False
+        usage_before = first_usage = _cgroup_usage(container)
+        with metrics.phase("run"):
+            for i, case in enumerate(test_cases):
+                started = time.perf_counter()
+                exit_code, stdout, stderr, truncated = _exec_capture(
+                    container,
+                    ["timeout", "-k", "1", str(time_limit), "sh", "-c", f"{run_cmd} < /code/tests/{i}.in"]
+                )
+                elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+                usage = None
+                if not truncated:
+                    usage_after = _cgroup_usage(container)
+                    usage = _usage_delta(usage_before, usage_after)
+                    usage_before = usage_after
+
+                if truncated:
+                    # The sandbox was killed, so the remaining cases cannot run
+                    output_limit_hit = True
+                    verdict = "RE"
+                    stderr += f"\nOutput limit exceeded ({MAX_OUTPUT_BYTES} bytes)"
+                elif exit_code in (TIMEOUT_EXIT_CODE, KILLED_EXIT_CODE) and elapsed_ms >= time_limit * 1000:
+                    verdict = "TLE"
+                elif exit_code != 0:
+                    verdict = "RE"
+                elif _same_output(stdout, case.get("expected_output") or ""):
+                    verdict = "AC"
+                else:
+                    verdict = "WA"
+
+                results.append({
+                    "case": i,
+                    "verdict": verdict,
+                    "time_ms": elapsed_ms,
+                    "exit_code": exit_code,
+                    "usage": usage,
+                    "stdout": stdout[:MAX_CASE_OUTPUT],
+                    "stderr": stderr[:MAX_CASE_OUTPUT],
+                })
+                if output_limit_hit:
+                    break
+        healthy = not output_limit_hit
+        if not output_limit_hit:
+            metrics.set_usage(first_usage, usage_before)
+
+        passed = sum(1 for r in results if r["verdict"] == "AC")
+        result = {
+            "status": "output_limit_exceeded" if output_limit_hit else "success",
+            "passed": passed,
+            "total": len(test_cases),
+            "compile_cached": compile_cached,
+            "results": results,
+        }
+        return result
+
+    except Exception as e:
+        result = {"status": "error", "output": str(e), "results": []}
+        return result
+
+    finally:
+        if container:
+            with metrics.phase("release"):
+                pool.release(container, healthy=healthy)
+        result["metrics"] = metrics.to_dict()
+
+
+def stream_code(language: str, code: str, max_bytes: int = MAX_OUTPUT_BYTES):
+    """Runs code and yields output events as they are produced.
+
+    Yields {"type": "stdout" | "stderr", "data": str} chunks followed by one
+    {"type": "exit", ...} event carrying the run's metrics. The container is
+    killed once more than `max_bytes` of output has been produced.
+    """
+    language = language.lower()
+
+    if language not in LANGS:
+        yield {"type": "exit", "status": "error", "output": f"Unsupported language: {language}"}
+        return
+
+    cfg = LANGS[language]
+    pool = get_pool(language)
+    container = None
+    healthy = False
+    metrics = RunMetrics()
+    filename, name_without_ext = _source_names(cfg)
+
+    def finish(event):
+        event["metrics"] = metrics.to_dict()
+        return event
+
+    try:
+        with metrics.phase("acquire"):
+            container = pool.acquire()
+        with metrics.phase("upload"):
+            container.put_archive("/code", _make_tar_bytes(filename, code))
+
+        with metrics.phase("compile"):
+            ok, compile_output, compile_cached = _compile(container, language, name_without_ext, code)
+        metrics.compile_cached = compile_cached
+        if not ok:
+            healthy = True
+            yield {"type": "stderr", "data": compile_output}
+            yield finish({"type": "exit", "status": "error", "exit_code": None, "truncated": False})
+            return
+
+        before = _cgroup_usage(container)
+        run_started = time.perf_counter()
+        exec_id, chunks = _exec_start(
+            container,
+            ["timeout", "-k", "1", str(EXEC_TIMEOUT), "sh", "-c", cfg["run"](name_without_ext)]
+        )
+        # Incremental decoders so multi-byte characters split across chunks survive
+        decoders = {
+            "stdout": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            "stderr": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+        total = 0
+        for out, err in chunks:
+            for name, data in (("stdout", out), ("stderr", err)):
+                if not data:
+                    continue
+                text = decoders[name].decode(data[:max(0, max_bytes - total)])
+                total += len(data)
+                if text:
+                    yield {"type": name, "data": text}
+            if total > max_bytes:
+                container.kill()
+                chunks.close()
+                metrics.timings["run"] = round((time.perf_counter() - run_started) * 1000, 2)
+                yield finish({
+                    "type": "exit",
+                    "status": "error",
+                    "exit_code": None,
+                    "truncated": True,
+                    "output": f"Output limit exceeded ({max_bytes} bytes)",
+                })
+                return
+
+        # Includes time the client took to consume the output
+        metrics.timings["run"] = round((time.perf_counter() - run_started) * 1000, 2)
+        healthy = True
+        exit_code = _exec_exit_code(exec_id)
+        metrics.exit_code = exit_code
+        metrics.set_usage(before, _cgroup_usage(container))
+        event = {
+            "type": "exit",
+            "status": "success" if exit_code == 0 else "error",
+            "exit_code": exit_code,
+            "truncated": False,
+        }
+        if exit_code == TIMEOUT_EXIT_CODE:
+            event["output"] = f"Time limit exceeded ({EXEC_TIMEOUT}s)"
+        yield finish(event)
 
     except Exception as e:
-        return {"status": "error", "output": str(e)}
+        yield finish({"type": "exit", "status": "error", "output": str(e)})
 
     finally:
+        # A client that disconnects mid-run leaves healthy=False → the container is recycled
         if container:
-            try:
-                container.remove(force=True)
-            except:
-                pass
+            pool.release(container, healthy=healthy)
@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+from collections import deque
+
+# Pool sizing (per language). POOL_MIN_SIZE containers are kept started and idle, so it
+# should cover the expected number of concurrent runs per language (the job queue runs
+# EXECUTION_LANG_CONCURRENCY at once); a run that finds the pool empty pays create+start itself.
+POOL_MIN_SIZE = int(os.getenv("EXECUTOR_POOL_MIN", 4))
+POOL_MAX_SIZE = int(os.getenv("EXECUTOR_POOL_MAX", 8))
+# How many runs a container may serve before it is thrown away: reuse vs isolation.
+# 1 = a fresh container for every run (safest). The create+start cost then moves off the
+#     request path to the background refill, but each run still costs one container.
+# >1 = reuse after `_reset`: cheaper under sustained load, but relies on user code running as
+#     SANDBOX_USER: it cannot touch root-owned files (compilers, /usr, /etc), and `_reset`
+#     kills all of its processes and wipes every directory it can write to. Anything outside
+#     that (e.g. kernel state shared by the container) is not reset.
+POOL_MAX_USES = int(os.getenv("EXECUTOR_POOL_MAX_USES", 1))
+POOL_ACQUIRE_TIMEOUT = float(os.getenv("EXECUTOR_POOL_ACQUIRE_TIMEOUT", 30))
+
+SANDBOX_MEM_LIMIT = os.getenv("EXECUTOR_MEM_LIMIT", "256m")
+# Unprivileged uid that compiles and runs user code (65534 = nobody)
+SANDBOX_UID = int(os.getenv("EXECUTOR_SANDBOX_UID", 65534))
+SANDBOX_USER = f"{SANDBOX_UID}:{SANDBOX_UID}"
+SANDBOX_ENV = {"HOME": "/tmp"}
+# The only places SANDBOX_USER can write to
+WRITABLE_DIRS = ("/code", "/tmp", "/var/tmp", "/dev/shm")
+
+
+class ContainerPool:
+    """Keeps pre-started, idle sandbox containers for one image.
+
+    Containers are started with an idle `sleep infinity` command so user code
+    can be run with `exec_run` straight away, skipping create/start on the hot path.
+    """
+
+    def __init__(self, client, image: str, image_cache, min_size: int = POOL_MIN_SIZE,
+                 max_size: int = POOL_MAX_SIZE, max_uses: int = POOL_MAX_USES):
+        self.client = client
+        self.image = image
+        self.image_cache = image_cache
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.max_uses = max(1, max_uses)
+
+        self._idle = deque()
+        self._uses = {}
+        self._total = 0          # idle + leased + being created
+        self._warming = 0        # being created for the idle set
+        self._cond = threading.Condition()
+        self._closed = False
+
+    # ---- container lifecycle ----
+    def _create(self):
+        # Cached image ID, no registry round trip
+        image_id = self.image_cache.ensure(self.image)
+
+        container = self.client.containers.create(
+            image=image_id,
+            command=["sleep", "infinity"],
+            working_dir="/code",
+            network_disabled=True,      # safe environment
+            mem_limit=SANDBOX_MEM_LIMIT,
+            init=True,                  # reap zombies left behind by user code
+            security_opt=["no-new-privileges"],   # no setuid escalation from SANDBOX_USER
+            detach=True
+        )
+        container.start()
+        # Source is uploaded as root; SANDBOX_USER needs to write build output next to it
+        exit_code, _ = container.exec_run(["chmod", "777", "/code"])
+        if exit_code != 0:
+            self._destroy(container)
+            raise RuntimeError(f"Could not prepare sandbox for {self.image}")
+        return container
+
+    def _destroy(self, container):
+        try:
+            container.remove(force=True)
+        except Exception:
+            pass
+
+    def _reset(self, container) -> bool:
+        """Makes the sandbox clean for the next user. Returns False if the container must be discarded.
+
+        Kills every process left by SANDBOX_USER (kill -1 as that user only reaches
+        its own processes, not init), wipes the directories it can write to, and
+        refuses reuse if any of its processes survived.
+        """
+        try:
+            container.exec_run(["sh", "-c", "kill -9 -1 2>/dev/null; true"], user=SANDBOX_USER)
+            wipe = " ".join(f"{d}/* {d}/.[!.]*" for d in WRITABLE_DIRS)
+            exit_code, _ = container.exec_run([
+                "sh", "-c",
+                f"rm -rf {wipe} 2>/dev/null; "
+                f"for p in /proc/[0-9]*; do [ \"$(stat -c %u $p 2>/dev/null)\" = {SANDBOX_UID} ] && exit 1; done; "
+                "exit 0",
+            ])
+            return exit_code == 0
+        except Exception:
+            return False
+
+    # ---- pool API ----
+    def acquire(self, timeout: float = POOL_ACQUIRE_TIMEOUT):
+        """Hands out a clean, running container. Blocks while the pool is at max size."""
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"Container pool for {self.image} is closed")
+                if self._idle:
+                    container = self._idle.popleft()
+                    self.fill()
+                    return container
+                if self._total < self.max_size:
+                    self._total += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No sandbox available for {self.image} (pool exhausted)")
+                self._cond.wait(remaining)
+
+        # Pool was empty but had room: create one on the caller's thread
+        try:
+            container = self._create()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._uses[container.id] = 0
+        return container
+
+    def release(self, container, healthy: bool = True):
+        """Returns a container after a run. It is reset and reused, or recycled in the background."""
+        with self._cond:
+            uses = self._uses.get(container.id, 0) + 1
+            self._uses[container.id] = uses
+            reuse = healthy and not self._closed and uses < self.max_uses
+
+        if reuse and self._reset(container):
+            with self._cond:
+                self._idle.append(container)
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._uses.pop(container.id, None)
+            self._total -= 1
+            self._cond.notify()
+        threading.Thread(target=self._destroy, args=(container,), daemon=True).start()
+        self.fill()
+
+    def fill(self):
+        """Starts creating, in parallel, enough containers to have `min_size` idle (bounded by `max_size`).
+
+        Returns immediately; the containers join the idle set as they come up.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            missing = min(
+                self.min_size - len(self._idle) - self._warming,
+                self.max_size - self._total,
+            )
+            if missing <= 0:
+                return
+            self._total += missing
+            self._warming += missing
+        for _ in range(missing):
+            threading.Thread(target=self._warm_one, daemon=True).start()
+
+    def _warm_one(self):
+        try:
+            container = self._create()
+        except Exception as e:
+            print(f"⚠️ Could not warm sandbox for {self.image}: {e}")
+            with self._cond:
+                self._total -= 1
+                self._warming -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._warming -= 1
+            if not self._closed:
+                self._uses[container.id] = 0
+                self._idle.append(container)
+                self._cond.notify()
+                return
+            self._total -= 1
+        self._destroy(container)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for container in idle:
+            self._destroy(container)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "image": self.image,
+                "idle": len(self._idle),
+                "warming": self._warming,
+                "total": self._total,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
@@ -0,0 +1,110 @@
+"""Dashboard listings served by a single aggregation each ($lookup joins + projections)."""
+from fastapi import Response
+
+from app.core.database import registrations_collection, submissions_collection
+from app.core.pagination import Page, finish_page, keyset_match, projection, sort_spec
+
+# Fields the dashboards render
+HACKATHON_CARD_FIELDS = {
+    "_id": {"$toString": "$_id"},
+    "name": 1,
+    "hackathon_type": 1,
+    "description": 1,
+    "start_date": 1,
+    "end_date": 1,
+    "is_active": 1,
+}
+SUBMISSION_FIELDS = {
+    "_id": {"$toString": "$_id"},
+    "hackathon_id": {"$toString": "$hackathon_id"},
+    "participant": 1,
+    "hackathon_type": 1,
+    "submission_filename": 1,
+    "github_url": 1,
+    "submitted_at": 1,
+    "status": 1,
+    "evaluation_result": 1,
+}
+
+
+def _lookup_hackathon(as_field: str, project: dict) -> dict:
+    """Joins a hackathon onto a document whose `hackathon_id` is the hackathon's ObjectId as a string."""
+    return {"$lookup": {
+        "from": "hackathons",
+        "let": {"hid": {"$convert": {"input": "$hackathon_id", "to": "objectId", "onError": None, "onNull": None}}},
+        "pipeline": [
+            {"$match": {"$expr": {"$eq": ["$_id", "$$hid"]}}},
+            {"$project": project},
+        ],
+        "as": as_field,
+    }}
+
+
+def _hackathon_name_stages() -> list:
+    return [
+        _lookup_hackathon("hackathon", {"_id": 0, "name": 1}),
+        {"$set": {"hackathon_name": {"$arrayElemAt": ["$hackathon.name", 0]}}},
+        {"$unset": "hackathon"},
+    ]
+
+
+def participant_hackathons_pipeline(username: str) -> list:
+    """Registered hackathons, each with the participant's submission (if any) attached."""
+    return [
+        {"$match": {"participant_username": username}},
+        _lookup_hackathon("hackathon", HACKATHON_CARD_FIELDS),
+        {"$unwind": "$hackathon"},   # drops registrations whose hackathon no longer exists
+        {"$lookup": {
+            "from": "submissions",
+            "let": {"hid": "$hackathon_id"},
+            "pipeline": [
+                {"$match": {"participant": username, "$expr": {"$eq": ["$hackathon_id", "$$hid"]}}},
+                {"$limit": 1},
+                {"$project": SUBMISSION_FIELDS},
+            ],
+            "as": "submission",
+        }},
+        {"$replaceRoot": {"newRoot": {"$mergeObjects": [
+            "$hackathon",
+            {"submission": {"$arrayElemAt": ["$submission", 0]}},
+        ]}}},
+    ]
+
+
+def _submission_page_stages(match: dict, page: Page, fields: str = None) -> list:
+    """Filter, keyset page (newest first) and projection, before any join."""
+    keyset = keyset_match(page, "submitted_at", descending=True)
+    project = SUBMISSION_FIELDS
+    if fields:
+        project = {name: SUBMISSION_FIELDS[name] for name in projection(fields, SUBMISSION_FIELDS)}
+        project.update(_id=SUBMISSION_FIELDS["_id"], submitted_at=1)   # needed for the cursor
+    return [
+        {"$match": {"$and": [match, keyset]} if keyset else match},
+        {"$sort": dict(sort_spec("submitted_at", descending=True))},
+        {"$limit": page.limit + 1},   # one extra to know whether there is a next page
+        {"$project": project},
+    ]
+
+
+def participant_submissions_pipeline(username: str, page: Page, fields: str = None) -> list:
+    return _submission_page_stages({"participant": username}, page, fields) + _hackathon_name_stages()
+
+
+def judge_assigned_pipeline(judge_username: str, page: Page, fields: str = None) -> list:
+    return _submission_page_stages({"assigned_judge": judge_username}, page, fields) + _hackathon_name_stages()
+
+
+async def participant_hackathons(username: str) -> list:
+    return await registrations_collection.aggregate(participant_hackathons_pipeline(username)).to_list(None)
+
+
+async def participant_submissions(username: str, page: Page, response: Response, fields: str = None) -> list:
+    pipeline = participant_submissions_pipeline(username, page, fields)
+    docs = await submissions_collection.aggregate(pipeline).to_list(None)
+    return finish_page(docs, page, response, "submitted_at")
+
+
+async def judge_assigned(judge_username: str, page: Page, response: Response, fields: str = None) -> list:
+    pipeline = judge_assigned_pipeline(judge_username, page, fields)
+    docs = await submissions_collection.aggregate(pipeline).to_list(None)
+    return finish_page(docs, page, response, "submitted_at")
@@ -0,0 +1,147 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+EVAL_WORKERS = int(os.getenv("EVAL_WORKERS", 2))
+EVAL_TIMEOUT = float(os.getenv("EVAL_TIMEOUT", 120))               # seconds per evaluation
+EVAL_MEMORY_LIMIT_MB = int(os.getenv("EVAL_MEMORY_LIMIT_MB", 4096))  # address-space cap per worker, 0 = none
+
+
+class EvaluationError(Exception):
+    pass
+
+
+class EvaluationTimeout(EvaluationError):
+    pass
+
+
+class EvaluationCrashed(EvaluationError):
+    pass
+
+
+def _limit_memory(limit_mb: int):
+    """Worker initializer: caps the process address space so a runaway model fails alone."""
+    if not limit_mb:
+        return
+    try:
+        import resource
+        limit = limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass   # not supported on this platform
+
+
+class _Worker:
+    """One single-process executor, so a failing job can be killed without touching the others."""
+
+    def __init__(self, executor: ProcessPoolExecutor, pid: int):
+        self.executor = executor
+        self.pid = pid
+
+    def kill(self):
+        try:
+            os.kill(self.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:
+            pass   # already gone
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class EvaluationPool:
+    """Runs CPU-heavy evaluations in worker processes, off the API event loop.
+
+    Each worker is its own single-process executor. A job that times out or
+    crashes its worker (hang, OOM, segfault in an untrusted model) only loses
+    that worker, which is killed and replaced; jobs running in the other
+    workers are not affected.
+    """
+
+    def __init__(self, workers: int = EVAL_WORKERS, timeout: float = EVAL_TIMEOUT,
+                 memory_limit_mb: int = EVAL_MEMORY_LIMIT_MB):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._slots = None
+        self._idle = []
+        self._busy = set()
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+
+    async def _spawn(self) -> _Worker:
+        executor = ProcessPoolExecutor(
+            max_workers=1,
+            # spawn: don't fork an API process that holds threads, sockets and Docker clients
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_limit_memory,
+            initargs=(self.memory_limit_mb,),
+        )
+        # Starts the process and tells us which one to kill if a job hangs
+        pid = await asyncio.get_running_loop().run_in_executor(executor, os.getpid)
+        return _Worker(executor, pid)
+
+    def _discard(self, worker: _Worker):
+        self.restarts += 1
+        worker.kill()
+
+    async def run(self, fn, *args, timeout: float = None, **kwargs):
+        """Runs fn(*args, **kwargs) in a worker process and awaits its result."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else await self._spawn()
+            self._busy.add(worker)
+            healthy = False
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(
+                        worker.executor, functools.partial(fn, *args, **kwargs)
+                    ),
+                    timeout or self.timeout,
+                )
+                healthy = True
+            except asyncio.TimeoutError:
+                self.failed += 1
+                raise EvaluationTimeout(f"Evaluation exceeded {timeout or self.timeout:.0f}s and was stopped")
+            except BrokenProcessPool:
+                self.failed += 1
+                raise EvaluationCrashed("Evaluation worker crashed (out of memory or invalid model)")
+            except MemoryError:
+                self.failed += 1
+                healthy = True   # raised inside the job; the worker itself is fine
+                raise EvaluationCrashed(f"Evaluation exceeded the {self.memory_limit_mb} MB memory limit")
+            except Exception:
+                healthy = True   # the job itself raised
+                raise
+            finally:
+                self._busy.discard(worker)
+                if healthy:
+                    self._idle.append(worker)
+                else:
+                    # Timed out, crashed or cancelled mid-job: don't reuse the process
+                    self._discard(worker)
+            self.completed += 1
+            return result
+
+    def shutdown(self):
+        for worker in self._idle + list(self._busy):
+            worker.executor.shutdown(wait=False, cancel_futures=True)
+        self._idle.clear()
+        self._busy.clear()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": len(self._idle) + len(self._busy),
+            "busy": len(self._busy),
+            "completed": self.completed,
+            "failed": self.failed,
+            "restarts": self.restarts,
+        }
+
+
+evaluation_pool = EvaluationPool()
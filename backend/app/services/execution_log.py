@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from app.core.database import executions_collection
+
+
+async def record_execution(source: str, language: str, result: dict, **extra):
+    """Stores the timings and resource usage of one sandbox run. Never raises."""
+    doc = {
+        "source": source,
+        "language": language.lower(),
+        "status": result.get("status"),
+        "metrics": result.get("metrics"),
+        "created_at": datetime.utcnow(),
+        **extra,
+    }
+    if "results" in result:
+        doc["passed"] = result.get("passed")
+        doc["total"] = result.get("total")
+        doc["cases"] = [
+            {"case": r["case"], "verdict": r["verdict"], "time_ms": r["time_ms"], "usage": r["usage"]}
+            for r in result["results"]
+        ]
+
+    try:
+        await executions_collection.insert_one(doc)
+    except Exception as e:
+        print("⚠️ Could not record execution metrics:", e)
@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from starlette.concurrency import run_in_threadpool
+
+# "gemini" or "local"; defaults to gemini when an API key is configured
+EXPLANATION_PROVIDER = os.getenv("EXPLANATION_PROVIDER", "gemini" if os.getenv("GEMINI_API_KEY") else "local")
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", 1024))
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-pro")
+
+PROMPT_TEMPLATE = """
+You are an evaluator for a hackathon platform.
+
+Hackathon Type: {hackathon_type}
+Metrics: {metrics}
+Participant Username: {participant}
+Submitted Code Snippet: {code_preview}
+
+Write a clear human-friendly evaluation summary. Use this format:
+
+1. Overall Summary (2–3 sentences)
+2. Interpretation of Metrics
+3. Strengths (bullets)
+4. Weaknesses (bullets)
+5. Suggestions (bullets)
+"""
+
+
+class ExplanationProvider(ABC):
+    """Turns evaluation inputs (hackathon_type, metrics, participant, code_preview) into a summary."""
+
+    name = "base"
+
+    @abstractmethod
+    def generate(self, inputs: dict) -> str:
+        ...
+
+
+class GeminiProvider(ExplanationProvider):
+    name = "gemini"
+
+    def __init__(self, model_name: str = GEMINI_MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        # Configured once per process, on first use
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                self._model = genai.GenerativeModel(self.model_name)
+            return self._model
+
+    def generate(self, inputs: dict) -> str:
+        return self._get_model().generate_content(PROMPT_TEMPLATE.format(**inputs)).text
+
+
+class LocalTemplateProvider(ExplanationProvider):
+    """Offline stand-in: builds the same five sections from the metrics alone."""
+
+    name = "local"
+
+    def generate(self, inputs: dict) -> str:
+        metrics = inputs.get("metrics") or {}
+        scores = {k: v for k, v in metrics.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        strengths = [f"{k} is strong ({v:.2f})" for k, v in scores.items() if 0.8 <= v <= 1]
+        weaknesses = [f"{k} is low ({v:.2f})" for k, v in scores.items() if 0 <= v < 0.6]
+        flags = {k: v for k, v in metrics.items() if isinstance(v, bool)}
+        strengths += [f"{k} check passed" for k, v in flags.items() if v]
+        weaknesses += [f"{k} check failed" for k, v in flags.items() if not v]
+
+        lines = [
+            "1. Overall Summary",
+            f"{inputs.get('participant')}'s {inputs.get('hackathon_type')} submission was evaluated automatically. "
+            f"{len(strengths)} metric(s) stand out and {len(weaknesses)} need attention.",
+            "",
+            "2. Interpretation of Metrics",
+        ]
+        lines += [f"- {k}: {v}" for k, v in metrics.items()] or ["- No metrics were produced."]
+        lines += ["", "3. Strengths"] + [f"- {s}" for s in strengths or ["No standout metrics."]]
+        lines += ["", "4. Weaknesses"] + [f"- {w}" for w in weaknesses or ["No weak metrics."]]
+        lines += ["", "5. Suggestions"] + [
+            f"- Improve {w.split(' ')[0]}." for w in weaknesses
+        ] + ["- Document the approach and how to reproduce the results."]
+        return "\n".join(lines)
+
+
+PROVIDERS = {"gemini": GeminiProvider, "local": LocalTemplateProvider}
+
+
+class _Abandoned(Exception):
+    """Set on an in-flight future whose caller was cancelled; the waiters retry on their own."""
+
+
+class ExplanationService:
+    """Caches explanations by the hash of their inputs and coalesces identical in-flight requests.
+
+    Provider errors fall back to the local template (not cached, so the next
+    evaluation retries the real provider).
+    """
+
+    def __init__(self, provider: ExplanationProvider, fallback: ExplanationProvider = None,
+                 max_entries: int = EXPLANATION_CACHE_SIZE):
+        self.provider = provider
+        self.fallback = fallback or LocalTemplateProvider()
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.coalesced = 0
+        self.latency = {}
+
+    @staticmethod
+    def key(provider_name: str, inputs: dict) -> str:
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(f"{provider_name}|{payload}".encode("utf-8")).hexdigest()
+
+    async def explain(self, inputs: dict) -> str:
+        key = self.key(self.provider.name, inputs)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except _Abandoned:
+                return await self.explain(inputs)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            text, cacheable = await self._generate(inputs)
+            if cacheable:
+                self._cache[key] = text
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            future.set_result(text)
+            return text
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                # Cancelled (CancelledError skips the except above): don't leave waiters hanging
+                future.set_exception(_Abandoned())
+            future.exception()   # mark retrieved when nobody else was waiting
+
+    async def _generate(self, inputs: dict):
+        try:
+            return await self._timed(self.provider, inputs), True
+        except Exception as e:
+            print(f"⚠️ {self.provider.name} explanation failed, using local template: {e}")
+            return await self._timed(self.fallback, inputs), False
+
+    async def _timed(self, provider: ExplanationProvider, inputs: dict) -> str:
+        stats = self.latency.setdefault(provider.name, {"calls": 0, "failures": 0, "total_ms": 0.0, "last_ms": None})
+        started = time.perf_counter()
+        try:
+            # Provider calls block (network / CPU), so they run in the thread pool
+            return await run_in_threadpool(provider.generate, inputs)
+        except Exception:
+            stats["failures"] += 1
+            raise
+        finally:
+            elapsed = round((time.perf_counter() - started) * 1000, 1)
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed
+            stats["last_ms"] = elapsed
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.provider.name,
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "latency": {
+                name: {**s, "avg_ms": round(s["total_ms"] / s["calls"], 1) if s["calls"] else None}
+                for name, s in self.latency.items()
+            },
+        }
+
+
+explainer = ExplanationService(PROVIDERS.get(EXPLANATION_PROVIDER, LocalTemplateProvider)())
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Default hidden test set, plus optional per-hackathon sets at {TEST_DATA_DIR}/{hackathon_id}/test.csv
+TEST_DATA_PATH = os.getenv("TEST_DATA_PATH", r"D:\Projects\Hacklens\backend\app\routes\test.csv")
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TEST_DATA_DIR = os.path.abspath(os.getenv("TEST_DATA_DIR", os.path.join(_BACKEND_DIR, "test_data")))
+# Parsed datasets are stored here as .npy files (one subdirectory per dataset) and memory-mapped
+TEST_DATA_CACHE_DIR = os.path.abspath(os.getenv("TEST_DATA_CACHE_DIR", os.path.join(_BACKEND_DIR, "test_data_cache")))
+TARGET_COLUMN = "target"
+# hackathon_id becomes a directory name, so only plain ids are accepted
+HACKATHON_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class HiddenTestSet:
+    """A parsed hidden test set: float32 features and targets, both read-only memory maps."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, fingerprint: str):
+        self.X = X
+        self.y = y
+        self.fingerprint = fingerprint
+
+    def __len__(self):
+        return len(self.y)
+
+
+_lock = threading.Lock()
+_loaded = {}   # csv path -> HiddenTestSet
+
+
+def validate_hackathon_id(hackathon_id) -> str:
+    """Returns the id as a string; ValueError if it could escape TEST_DATA_DIR (e.g. "../")."""
+    hackathon_id = str(hackathon_id)
+    if not HACKATHON_ID_PATTERN.fullmatch(hackathon_id):
+        raise ValueError(f"Invalid hackathon_id: {hackathon_id!r}")
+    return hackathon_id
+
+
+def dataset_path(hackathon_id: str = None) -> str:
+    if hackathon_id:
+        hackathon_id = validate_hackathon_id(hackathon_id)
+        candidate = os.path.join(TEST_DATA_DIR, str(hackathon_id), "test.csv")
+        if os.path.exists(candidate):
+            return candidate
+    return TEST_DATA_PATH
+
+
+def dataset_fingerprint(hackathon_id: str = None) -> str:
+    """Identifies the current version of a hackathon's test set (None if it is missing)."""
+    csv_path = dataset_path(hackathon_id)
+    return _fingerprint(csv_path) if os.path.exists(csv_path) else None
+
+
+def _fingerprint(csv_path: str) -> str:
+    """Changes whenever the CSV is replaced or edited."""
+    st = os.stat(csv_path)
+    stamp = f"{os.path.abspath(csv_path)}:{st.st_size}:{st.st_mtime_ns}"
+    return hashlib.sha256(stamp.encode("utf-8")).hexdigest()[:16]
+
+
+def _save_npy(path: str, array: np.ndarray):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _build(csv_path: str, cache_dir: str, x_path: str, y_path: str):
+    df = pd.read_csv(csv_path)
+    X = np.ascontiguousarray(df.drop(columns=[TARGET_COLUMN]).to_numpy(dtype=np.float32))
+    y = df[TARGET_COLUMN].to_numpy()
+    if y.dtype == object:
+        y = y.astype(str)   # object arrays cannot be memory-mapped
+    del df
+
+    _save_npy(x_path, X)
+    _save_npy(y_path, y)
+
+    # Drop files from previous versions of this dataset (the directory holds nothing else)
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if path not in (x_path, y_path) and not name.endswith(".tmp"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _cache_dir(hackathon_id: str, csv_path: str) -> str:
+    # Hackathon sets live under hackathons/, so no id can collide with the default set
+    if csv_path == TEST_DATA_PATH:
+        return os.path.join(TEST_DATA_CACHE_DIR, "default")
+    return os.path.join(TEST_DATA_CACHE_DIR, "hackathons", hackathon_id)
+
+
+def load_test_data(hackathon_id: str = None) -> HiddenTestSet:
+    """Returns the hackathon's test set, parsing the CSV only when it has changed.
+
+    The parsed arrays are persisted as .npy and opened with mmap_mode="r", so
+    every worker process shares one copy through the OS page cache.
+    """
+    if hackathon_id:
+        hackathon_id = validate_hackathon_id(hackathon_id)
+    csv_path = dataset_path(hackathon_id)
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError("Missing test data CSV at TEST_DATA_PATH.")
+
+    fingerprint = _fingerprint(csv_path)
+    cached = _loaded.get(csv_path)
+    if cached is not None and cached.fingerprint == fingerprint:
+        return cached
+
+    with _lock:
+        cached = _loaded.get(csv_path)
+        if cached is not None and cached.fingerprint == fingerprint:
+            return cached
+
+        cache_dir = _cache_dir(hackathon_id, csv_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        x_path = os.path.join(cache_dir, f"{fingerprint}.X.npy")
+        y_path = os.path.join(cache_dir, f"{fingerprint}.y.npy")
+        if not (os.path.exists(x_path) and os.path.exists(y_path)):
+            _build(csv_path, cache_dir, x_path, y_path)
+
+        dataset = HiddenTestSet(
+            np.load(x_path, mmap_mode="r"),
+            np.load(y_path, mmap_mode="r"),
+            fingerprint,
+        )
+        _loaded[csv_path] = dataset
+        return dataset
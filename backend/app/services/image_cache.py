@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from docker.errors import ImageNotFound
+
+# How often (seconds) images are re-pulled in the background to pick up new tags
+IMAGE_REFRESH_TTL = int(os.getenv("EXECUTOR_IMAGE_TTL", 3600))
+# After a failed resolve, ensure() fails fast for this long instead of hitting the registry again
+IMAGE_RETRY_SECONDS = float(os.getenv("EXECUTOR_IMAGE_RETRY_SECONDS", 30))
+
+
+class ImageCache:
+    """Resolves each sandbox image once and caches its local image ID.
+
+    Images are checked (and pulled if missing) at startup or on first use, then
+    re-pulled in the background every `ttl` seconds. The execution path only
+    reads the cached ID and never talks to the registry.
+    """
+
+    def __init__(self, client, images, ttl: int = IMAGE_REFRESH_TTL, retry_after: float = IMAGE_RETRY_SECONDS):
+        self.client = client
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._retry_at = {}
+        self._lock = threading.Lock()
+        self._image_locks = {image: threading.Lock() for image in images}
+        self._state = {
+            image: {"status": "unknown", "id": None, "checked_at": None, "error": None}
+            for image in images
+        }
+        self._refresher = None
+        self._stop = threading.Event()
+
+    def _record(self, image: str, **fields):
+        with self._lock:
+            self._state[image].update(fields, checked_at=datetime.now(timezone.utc).isoformat())
+
+    def _resolve(self, image: str, pull: bool = False):
+        """Looks the image up locally (pulling it if missing or if `pull` is set)."""
+        try:
+            if pull:
+                img = self.client.images.pull(image)
+            else:
+                try:
+                    img = self.client.images.get(image)
+                except ImageNotFound:
+                    self._record(image, status="pulling")
+                    img = self.client.images.pull(image)
+            self._record(image, status="ready", id=img.id, error=None)
+            self._retry_at.pop(image, None)
+        except Exception as e:
+            # Keep serving a previously resolved ID if a refresh fails (e.g. no network)
+            with self._lock:
+                has_id = self._state[image]["id"] is not None
+            self._record(image, status="ready" if has_id else "unavailable", error=str(e))
+            self._retry_at[image] = time.monotonic() + self.retry_after
+
+    def ensure(self, image: str) -> str:
+        """Returns the cached image ID, resolving it on first use.
+
+        While an image is unavailable, calls within `retry_after` seconds of the
+        last failed resolve raise straight away.
+        """
+        if image not in self._state:
+            with self._lock:
+                self._state.setdefault(image, {"status": "unknown", "id": None, "checked_at": None, "error": None})
+                self._image_locks.setdefault(image, threading.Lock())
+
+        entry = self._state[image]
+        if entry["id"]:
+            return entry["id"]
+
+        with self._image_locks[image]:
+            if not self._state[image]["id"] and time.monotonic() >= self._retry_at.get(image, 0):
+                self._resolve(image)
+
+        entry = self._state[image]
+        if not entry["id"]:
+            raise RuntimeError(f"Image {image} is not available: {entry['error']}")
+        return entry["id"]
+
+    def _refresh_loop(self):
+        # Initial check, then a background re-pull every TTL
+        for image in list(self._state):
+            with self._image_locks[image]:
+                self._resolve(image)
+        while not self._stop.wait(self.ttl):
+            for image in list(self._state):
+                with self._image_locks[image]:
+                    self._resolve(image, pull=True)
+
+    def start(self):
+        if self._refresher is None:
+            self._refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._refresher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {image: dict(entry) for image, entry in self._state.items()}
+
+    def ready(self) -> bool:
+        with self._lock:
+            return all(entry["id"] for entry in self._state.values())
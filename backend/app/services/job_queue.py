@@ -0,0 +1,160 @@
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+from starlette.concurrency import run_in_threadpool
+
+from app.services.code_executor import LANGS, execute_code
+from app.services.execution_log import record_execution
+
+EXECUTION_WORKERS = int(os.getenv("EXECUTION_WORKERS", 4))
+EXECUTION_QUEUE_SIZE = int(os.getenv("EXECUTION_QUEUE_SIZE", 100))
+# Max concurrent runs per language (defaults to the per-language sandbox pool size)
+EXECUTION_LANG_CONCURRENCY = int(os.getenv("EXECUTION_LANG_CONCURRENCY", os.getenv("EXECUTOR_POOL_MAX", 4)))
+# Finished jobs are kept this long (seconds) so clients can fetch the result
+EXECUTION_JOB_TTL = int(os.getenv("EXECUTION_JOB_TTL", 600))
+
+TERMINAL_STATES = ("finished", "failed")
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ExecutionJobQueue:
+    """In-process queue of code execution jobs drained by a fixed set of async workers.
+
+    Workers hand the blocking `execute_code` call to the thread pool, so API
+    requests only enqueue and return a job ID.
+    """
+
+    def __init__(self, workers: int = EXECUTION_WORKERS, max_queue: int = EXECUTION_QUEUE_SIZE,
+                 lang_concurrency: int = EXECUTION_LANG_CONCURRENCY, job_ttl: int = EXECUTION_JOB_TTL):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.lang_concurrency = lang_concurrency
+        self.job_ttl = job_ttl
+
+        self._queue = None
+        self._tasks = []
+        self._limits = {}
+        self._jobs = {}
+        self._changed = {}
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._limits = {lang: asyncio.Semaphore(self.lang_concurrency) for lang in LANGS}
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ---- public API ----
+    def submit(self, language: str, code: str) -> dict:
+        """Enqueues a run. Raises QueueFull when the queue is at capacity (backpressure)."""
+        if self._queue is None:
+            raise RuntimeError("Execution job queue is not running")
+        self._prune()
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "language": language.lower(),
+            "status": "queued",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+        }
+        try:
+            self._queue.put_nowait((job_id, code))
+        except asyncio.QueueFull:
+            raise QueueFull(f"Execution queue is full ({self.max_queue} jobs waiting)")
+
+        self._jobs[job_id] = job
+        self._changed[job_id] = asyncio.Event()
+        return self.get(job_id)
+
+    def get(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        snapshot = dict(job)
+        if snapshot["status"] == "queued":
+            snapshot["queue_size"] = self._queue.qsize()
+        return snapshot
+
+    async def watch(self, job_id: str):
+        """Yields a job snapshot every time its status changes, until it is finished."""
+        while job_id in self._jobs:
+            event = self._changed[job_id]
+            job = self.get(job_id)
+            yield job
+            if job["status"] in TERMINAL_STATES:
+                return
+            await event.wait()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue,
+            "jobs": len(self._jobs),
+        }
+
+    # ---- internals ----
+    def _update(self, job_id: str, **fields):
+        self._jobs[job_id].update(fields)
+        # Wake up watchers, then arm a fresh event for the next change
+        self._changed[job_id].set()
+        self._changed[job_id] = asyncio.Event()
+
+    def _prune(self):
+        cutoff = time.time() - self.job_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in TERMINAL_STATES
+            and datetime.fromisoformat(job["finished_at"]).timestamp() < cutoff
+        ]
+        for job_id in expired:
+            self._jobs.pop(job_id, None)
+            self._changed.pop(job_id, None)
+
+    async def _worker(self):
+        while True:
+            job_id, code = await self._queue.get()
+            language = self._jobs[job_id]["language"]
+            try:
+                limit = self._limits.get(language)
+                if limit is None:
+                    result = {"status": "error", "output": f"Unsupported language: {language}"}
+                else:
+                    async with limit:
+                        self._update(job_id, status="running", started_at=datetime.now(timezone.utc).isoformat())
+                        result = await run_in_threadpool(execute_code, language, code)
+                    await record_execution("job", language, result, job_id=job_id)
+                self._update(
+                    job_id,
+                    status="finished",
+                    result=result,
+                    finished_at=datetime.now(timezone.utc).isoformat(),
+                )
+            except Exception as e:
+                self._update(
+                    job_id,
+                    status="failed",
+                    result={"status": "error", "output": str(e)},
+                    finished_at=datetime.now(timezone.utc).isoformat(),
+                )
+            finally:
+                self._queue.task_done()
+
+
+execution_jobs = ExecutionJobQueue()
@@ -0,0 +1,226 @@
+import asyncio
+import os
+import random
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import hackathon_collection, submissions_collection
+from app.services.code_executor import execute_code
+from app.services.evaluation_pool import evaluation_pool
+from app.services.explanations import explainer
+from app.services.model_evaluation import evaluate_onnx_model
+
+# Max judge evaluations running at once; the rest wait their turn in the background
+JUDGE_PIPELINE_CONCURRENCY = int(os.getenv("JUDGE_PIPELINE_CONCURRENCY", 4))
+CODE_PREVIEW_CHARS = 1500
+
+STAGES = ("metrics", "code_preview", "explanation", "persist")
+ACTIVE_STATES = ("queued", "running")
+
+# Source extensions runnable by the code executor for codeathon submissions
+CODE_LANGUAGES = {".py": "python", ".cpp": "cpp", ".java": "java"}
+PREVIEW_EXTENSIONS = (".py", ".cpp", ".java", ".txt", "Dockerfile")
+
+_limit = None
+_tasks = set()
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+# Pipelines queued before this are left over from a previous process
+_process_started = _now()
+
+
+async def _set(submission_id, fields: dict):
+    await submissions_collection.update_one({"_id": submission_id}, {"$set": fields})
+
+
+async def start_evaluation(submission: dict, upload_dir: str):
+    """Records a queued pipeline on the submission and runs it in the background.
+
+    The submission is claimed atomically, so concurrent requests start at most one
+    pipeline; returns None when an evaluation is already queued or running.
+    """
+    global _limit
+    if _limit is None:
+        _limit = asyncio.Semaphore(JUDGE_PIPELINE_CONCURRENCY)
+
+    pipeline = {
+        "status": "queued",
+        "queued_at": _now(),
+        "started_at": None,
+        "finished_at": None,
+        "error": None,
+        "stages": {name: {"status": "pending", "duration_ms": None} for name in STAGES},
+    }
+    claimed = await submissions_collection.find_one_and_update(
+        {"_id": submission["_id"], "evaluation_pipeline.status": {"$nin": list(ACTIVE_STATES)}},
+        {"$set": {"evaluation_pipeline": pipeline}},
+        projection={"_id": 1},
+    )
+    if claimed is None:
+        return None
+
+    task = asyncio.create_task(_run(submission, upload_dir))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return pipeline
+
+
+async def recover_interrupted_evaluations() -> int:
+    """Marks pipelines left queued/running by a previous process as failed, so they can be re-queued.
+
+    Pipelines only run inside the process that queued them, so any queued before this
+    process started is dead. Safe to run while new evaluations are being queued.
+    """
+    result = await submissions_collection.update_many(
+        {
+            "evaluation_pipeline.status": {"$in": list(ACTIVE_STATES)},
+            "evaluation_pipeline.queued_at": {"$lt": _process_started},
+        },
+        {"$set": {
+            "evaluation_pipeline.status": "failed",
+            "evaluation_pipeline.error": "Interrupted by a server restart",
+            "evaluation_pipeline.finished_at": _now(),
+        }},
+    )
+    return result.modified_count
+
+
+async def _run(submission: dict, upload_dir: str):
+    sub_id = submission["_id"]
+    async with _limit:
+        await _set(sub_id, {"evaluation_pipeline.status": "running", "evaluation_pipeline.started_at": _now()})
+        context = {"submission": submission, "upload_dir": upload_dir}
+        try:
+            for name in STAGES:
+                await _run_stage(sub_id, name, context)
+            await _set(sub_id, {"evaluation_pipeline.status": "finished", "evaluation_pipeline.finished_at": _now()})
+        except Exception as e:
+            await _set(sub_id, {
+                "evaluation_pipeline.status": "failed",
+                "evaluation_pipeline.error": str(e),
+                "evaluation_pipeline.finished_at": _now(),
+            })
+
+
+async def _run_stage(sub_id, name: str, context: dict):
+    prefix = f"evaluation_pipeline.stages.{name}"
+    await _set(sub_id, {f"{prefix}.status": "running", f"{prefix}.started_at": _now()})
+    started = time.perf_counter()
+    try:
+        await STAGE_HANDLERS[name](context)
+    except Exception as e:
+        await _set(sub_id, {
+            f"{prefix}.status": "failed",
+            f"{prefix}.error": str(e),
+            f"{prefix}.duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+        raise
+    await _set(sub_id, {
+        f"{prefix}.status": "done",
+        f"{prefix}.duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+
+
+# ---- Stages ----
+async def _metrics_stage(context: dict):
+    submission = context["submission"]
+    hack_type = submission["hackathon_type"]
+    filename = submission.get("submission_filename")
+    file_path = os.path.join(context["upload_dir"], filename) if filename else None
+
+    if hack_type == "ml_hackathon":
+        if not file_path or not file_path.endswith(".onnx"):
+            raise ValueError("ML submissions must be an .onnx model")
+        hackathon_id = submission.get("hackathon_id")
+        metrics = None
+        if hackathon_id and ObjectId.is_valid(hackathon_id):
+            hackathon = await hackathon_collection.find_one({"_id": ObjectId(hackathon_id)}, {"metrics": 1})
+            metrics = (hackathon or {}).get("metrics")
+        context["metrics"] = await evaluation_pool.run(evaluate_onnx_model, file_path, hackathon_id, metrics)
+
+    elif hack_type == "codeathon":
+        language = CODE_LANGUAGES.get(os.path.splitext(file_path or "")[1])
+        if language is None:
+            raise ValueError(f"Unsupported code submission: {filename}")
+        code = await run_in_threadpool(_read_text, file_path)
+        result = await run_in_threadpool(execute_code, language, code)
+        context["metrics"] = {
+            "language": language,
+            "run_status": result.get("status"),
+            "output": (result.get("output") or "")[:CODE_PREVIEW_CHARS],
+            "runtime": result.get("metrics"),
+        }
+
+    else:
+        context["metrics"] = {
+            "docker_valid": bool(random.choice([True, False])),
+            "deployment_ready": bool(random.choice([True, False])),
+            "final_score": round(random.uniform(0.6, 0.95), 2)
+        }
+
+
+def _read_text(path: str, limit: int = None) -> str:
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read(limit) if limit else f.read()
+
+
+def _find_code(upload_dir: str, filename: str) -> str:
+    """Code shown to the judge/LLM: the submission itself, or the script next to an .onnx model."""
+    file_path = os.path.join(upload_dir, filename)
+    try:
+        # If file is text-based (py, cpp, java, txt, Dockerfile)
+        if file_path.endswith(PREVIEW_EXTENSIONS):
+            return _read_text(file_path, CODE_PREVIEW_CHARS)
+
+        # If ML model (.onnx), try to find a script with the same prefix
+        if file_path.endswith(".onnx"):
+            base = filename.split(".")[0]
+            for ext in [".py", ".ipynb"]:
+                alt = os.path.join(upload_dir, f"{base}{ext}")
+                if os.path.exists(alt):
+                    return _read_text(alt, CODE_PREVIEW_CHARS)
+    except Exception as e:
+        return f"(Error reading code: {str(e)})"
+    return "(No code found)"
+
+
+async def _code_preview_stage(context: dict):
+    filename = context["submission"].get("submission_filename")
+    context["code_preview"] = (
+        await run_in_threadpool(_find_code, context["upload_dir"], filename) if filename else "(No code found)"
+    )
+
+
+async def _explanation_stage(context: dict):
+    submission = context["submission"]
+    # Cached by input hash; identical requests already in flight share one provider call
+    context["explanation"] = await explainer.explain({
+        "hackathon_type": submission["hackathon_type"],
+        "metrics": context["metrics"],
+        "participant": submission["participant"],
+        "code_preview": context["code_preview"],
+    })
+
+
+async def _persist_stage(context: dict):
+    await _set(context["submission"]["_id"], {
+        "status": "evaluated",
+        "evaluation_result": context["metrics"],
+        "evaluation_result_text": context["explanation"],
+        "evaluated_at": datetime.utcnow(),
+    })
+
+
+STAGE_HANDLERS = {
+    "metrics": _metrics_stage,
+    "code_preview": _code_preview_stage,
+    "explanation": _explanation_stage,
+    "persist": _persist_stage,
+}
@@ -0,0 +1,278 @@
+import os
+
+import numpy as np
+
+# The confusion matrix is dense (k x k), so a model emitting arbitrary values is rejected early
+MAX_CLASSES = int(os.getenv("MAX_CLASSES", 1000))
+SIGMOID_THRESHOLD = 0.5
+# ROC-AUC needs every score, not counts: above this many rows it is computed on a uniform
+# random sample of this size, so its memory stays bounded (about rows x classes x 4 bytes)
+ROC_AUC_MAX_ROWS = int(os.getenv("ROC_AUC_MAX_ROWS", 1_000_000))
+
+
+class ConfusionMatrix:
+    """Confusion matrix accumulated batch by batch.
+
+    Labels are discovered as they appear (in y_true or y_pred), so the whole
+    prediction vector never has to be held in memory at once.
+    """
+
+    def __init__(self, max_labels: int = MAX_CLASSES):
+        self.max_labels = max_labels
+        self.labels = np.empty(0)
+        self.matrix = np.zeros((0, 0), dtype=np.int64)
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+
+        batch_labels = np.union1d(y_true, y_pred)
+        labels = np.union1d(self.labels, batch_labels) if self.labels.size else batch_labels
+        if labels.size > self.max_labels:
+            raise ValueError(
+                f"Predictions and targets contain {labels.size} distinct labels (max {self.max_labels}); "
+                "is this a regression model evaluated with classification metrics?"
+            )
+        if labels.size != self.labels.size:
+            # New labels: re-embed the counts collected so far
+            grown = np.zeros((labels.size, labels.size), dtype=np.int64)
+            if self.labels.size:
+                idx = np.searchsorted(labels, self.labels)
+                grown[np.ix_(idx, idx)] = self.matrix
+            self.labels, self.matrix = labels, grown
+
+        k = labels.size
+        t = np.searchsorted(labels, y_true)
+        p = np.searchsorted(labels, y_pred)
+        self.matrix += np.bincount(t * k + p, minlength=k * k).reshape(k, k)
+
+    @property
+    def total(self) -> int:
+        return int(self.matrix.sum())
+
+
+def class_predictions(output) -> np.ndarray:
+    """Class labels from a model output.
+
+    One column per class → argmax; a single probability column (sigmoid) → thresholded
+    at 0.5; a label vector is used as is, but must not hold fractional values.
+    """
+    output = np.asarray(output)
+    if output.ndim > 1 and output.shape[1] > 1:
+        return np.argmax(output, axis=1)
+
+    labels = output.ravel()
+    if not np.issubdtype(labels.dtype, np.floating):
+        return labels
+    if output.ndim > 1:
+        return (labels >= SIGMOID_THRESHOLD).astype(np.int64)
+    if not np.all(np.isfinite(labels)) or np.any(labels != np.round(labels)):
+        raise ValueError(
+            "Model outputs non-integer values; classification metrics need class labels, "
+            "one probability column per class or a single (n, 1) probability column"
+        )
+    return labels.astype(np.int64)
+
+
+def _safe_divide(num, den):
+    """Element-wise num / den with 0 where den == 0 (sklearn's zero_division=0)."""
+    out = np.zeros_like(num, dtype=np.float64)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def classification_metrics(cm: ConfusionMatrix) -> dict:
+    """Accuracy plus weighted and macro precision/recall/F1, all from one confusion matrix."""
+    m = cm.matrix.astype(np.float64)
+    total = m.sum()
+    if total == 0:
+        return {name: 0.0 for name in CLASSIFICATION_METRICS}
+
+    tp = np.diag(m)
+    support = m.sum(axis=1)
+    predicted = m.sum(axis=0)
+
+    precision = _safe_divide(tp, predicted)
+    recall = _safe_divide(tp, support)
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+    weights = support / total
+
+    return {
+        "accuracy": float(tp.sum() / total),
+        "precision": float((precision * weights).sum()),
+        "recall": float((recall * weights).sum()),
+        "f1_score": float((f1 * weights).sum()),
+        "precision_macro": float(precision.mean()),
+        "recall_macro": float(recall.mean()),
+        "f1_macro": float(f1.mean()),
+    }
+
+
+def _binary_auc(y_true: np.ndarray, scores: np.ndarray):
+    """ROC-AUC via the rank-sum (Mann-Whitney U) formula, with tied scores sharing their average rank."""
+    n_pos = int(y_true.sum())
+    n_neg = len(y_true) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return None
+    _, inverse, counts = np.unique(scores, return_inverse=True, return_counts=True)
+    ends = np.cumsum(counts)
+    ranks = ((ends - counts + 1 + ends) / 2.0)[inverse]
+    return float((ranks[y_true].sum() - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg))
+
+
+def _label_columns(labels: np.ndarray, n_columns: int) -> dict:
+    """Maps each target label to its score column.
+
+    Integer labels 0..k-1 are their own column; otherwise the k sorted labels map to the
+    k columns in order (the class order classifiers export probabilities in).
+    """
+    if (np.issubdtype(labels.dtype, np.number) and np.all(labels == np.round(labels))
+            and labels.min() >= 0 and labels.max() < n_columns):
+        return {label: int(label) for label in labels}
+    if len(labels) == n_columns:
+        return {label: column for column, label in enumerate(labels)}
+    raise ValueError(
+        f"Cannot match {len(labels)} target labels to {n_columns} score columns for ROC-AUC"
+    )
+
+
+def roc_auc(y_true: np.ndarray, scores: np.ndarray, labels: np.ndarray = None):
+    """Binary AUC, or one-vs-rest macro AUC when `scores` has one column per class.
+
+    `labels` is the full set of target labels (defaults to those in y_true); see
+    _label_columns for how they are matched to score columns.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    labels = np.unique(y_true) if labels is None else np.asarray(labels)
+    if scores.ndim == 1 or scores.shape[1] == 1:
+        if len(labels) > 2:
+            raise ValueError("ROC-AUC from a single score column needs a binary target")
+        return _binary_auc(y_true == labels[-1], scores.ravel())
+
+    columns = _label_columns(labels, scores.shape[1])
+    if scores.shape[1] == 2:
+        positive = [label for label, column in columns.items() if column == 1]
+        return _binary_auc(y_true == positive[0], scores[:, 1]) if positive else None
+
+    aucs = [_binary_auc(y_true == label, scores[:, column]) for label, column in columns.items()]
+    aucs = [a for a in aucs if a is not None]
+    return float(np.mean(aucs)) if aucs else None
+
+
+class ScoreSample:
+    """Uniform random sample of at most `capacity` (target, scores) rows, kept while streaming.
+
+    Every row gets a random key and the rows with the smallest keys are kept (bottom-k
+    sampling), so memory is O(capacity) whatever the dataset size. Below the capacity all
+    rows are kept and the metrics are exact. `labels` is the label set of all rows seen.
+    """
+
+    def __init__(self, capacity: int = ROC_AUC_MAX_ROWS, seed: int = 0):
+        self.capacity = max(1, capacity)
+        self.rows_seen = 0
+        self.labels = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+        self._chunks = []   # (keys, y, scores)
+        self._buffered = 0
+
+    def add(self, y_true, scores):
+        y_true = np.asarray(y_true).ravel()
+        scores = np.asarray(scores, dtype=np.float32)
+        self.rows_seen += len(y_true)
+        batch_labels = np.unique(y_true)
+        self.labels = np.union1d(self.labels, batch_labels) if self.labels.size else batch_labels
+        self._chunks.append((self._rng.random(len(y_true)), y_true, scores))
+        self._buffered += len(y_true)
+        if self._buffered > 2 * self.capacity:
+            self._compact()
+
+    def _compact(self):
+        keys, y, scores = (np.concatenate(parts) for parts in zip(*self._chunks))
+        if len(keys) > self.capacity:
+            keep = np.argpartition(keys, self.capacity)[:self.capacity]
+            keys, y, scores = keys[keep], y[keep], scores[keep]
+        self._chunks = [(keys, y, scores)]
+        self._buffered = len(keys)
+
+    @property
+    def sampled(self) -> bool:
+        return self.rows_seen > self.capacity
+
+    def rows(self):
+        """(y_true, scores) of the sample."""
+        if not self._chunks:
+            return np.empty(0), np.empty(0)
+        self._compact()
+        _, y, scores = self._chunks[0]
+        return y, scores
+
+
+# ---- Configurable metrics engine ----
+CLASSIFICATION_METRICS = ("accuracy", "precision", "recall", "f1_score", "precision_macro", "recall_macro", "f1_macro")
+SCORE_METRICS = ("roc_auc",)
+REGRESSION_METRICS = ("rmse", "mae")
+AVAILABLE_METRICS = CLASSIFICATION_METRICS + SCORE_METRICS + REGRESSION_METRICS
+DEFAULT_METRICS = ("accuracy", "precision", "recall", "f1_score")
+
+# Weights of the leaderboard score (used when all four are computed)
+COMBINED_SCORE_WEIGHTS = {"accuracy": 0.4, "precision": 0.2, "recall": 0.2, "f1_score": 0.2}
+
+
+class MetricsAccumulator:
+    """Accumulates the metrics a hackathon asks for over batches of model outputs, in one pass.
+
+    Memory is bounded by the number of classes, plus ROC_AUC_MAX_ROWS rows of scores
+    when roc_auc is requested (beyond that it is computed on a sample, see ScoreSample).
+    """
+
+    def __init__(self, metrics=None):
+        requested = [m for m in (metrics or DEFAULT_METRICS) if m in AVAILABLE_METRICS]
+        self.metrics = requested or list(DEFAULT_METRICS)
+
+        self.classification = any(m in CLASSIFICATION_METRICS for m in self.metrics)
+        self.needs_scores = "roc_auc" in self.metrics
+        self.regression = any(m in REGRESSION_METRICS for m in self.metrics)
+
+        self.cm = ConfusionMatrix()
+        self.score_sample = ScoreSample() if self.needs_scores else None
+        self._count = 0
+        self._squared_error = 0.0
+        self._abs_error = 0.0
+
+    def update(self, y_true, output, scores=None):
+        """`output` is the model's first output for the batch; `scores` optional class probabilities."""
+        y_true = np.asarray(y_true)
+        output = np.asarray(output)
+
+        if self.classification:
+            self.cm.update(y_true, class_predictions(output))
+
+        if self.needs_scores:
+            if scores is None:
+                scores = output
+            self.score_sample.add(y_true, scores)
+
+        if self.regression:
+            error = output.reshape(len(y_true), -1)[:, 0].astype(np.float64) - y_true.astype(np.float64)
+            self._count += len(error)
+            self._squared_error += float(np.dot(error, error))
+            self._abs_error += float(np.abs(error).sum())
+
+    def result(self) -> dict:
+        values = {}
+        if self.classification:
+            values.update(classification_metrics(self.cm))
+        if self.needs_scores:
+            y_true, scores = self.score_sample.rows()
+            values["roc_auc"] = roc_auc(y_true, scores, self.score_sample.labels) if len(y_true) else None
+        if self.regression and self._count:
+            values["rmse"] = float(np.sqrt(self._squared_error / self._count))
+            values["mae"] = float(self._abs_error / self._count)
+
+        report = {name: values.get(name) for name in self.metrics}
+        if all(values.get(name) is not None for name in COMBINED_SCORE_WEIGHTS):
+            # Keep the base metrics the leaderboard score is built from
+            for name in COMBINED_SCORE_WEIGHTS:
+                report[name] = values[name]
+            report["final_combined_score"] = sum(w * values[name] for name, w in COMBINED_SCORE_WEIGHTS.items())
+        return report
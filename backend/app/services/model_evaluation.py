@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+
+from app.services.metrics import MetricsAccumulator
+from app.services.onnx_sessions import sessions
+from app.services.hidden_test_sets import load_test_data
+
+# Rows fed to the ONNX session per run() call (models with a fixed batch dimension use theirs)
+EVAL_BATCH_SIZE = int(os.getenv("EVAL_BATCH_SIZE", 8192))
+
+
+def evaluate_onnx_model(file_path: str, hackathon_id: str = None, metrics: list = None) -> dict:
+    """Scores an ONNX model against the hackathon's hidden test set.
+
+    Synchronous and self-contained so it can run inside an evaluation worker process;
+    the session and dataset caches live per worker.
+    """
+    # Parsed once per hackathon and memory-mapped (see services/hidden_test_sets.py)
+    data = load_test_data(hackathon_id)
+    y_test = data.y
+
+    # Cached by model content hash, so re-evaluations skip parsing/optimization
+    sess = sessions.get(file_path)
+    model_input = sess.get_inputs()[0]
+    input_name = model_input.name
+    output_names = [o.name for o in sess.get_outputs()]
+
+    scores = MetricsAccumulator(metrics)
+    # Classifiers exported with probabilities expose them as a second output
+    fetch = output_names[:2] if scores.needs_scores else output_names[:1]
+
+    # Feed the test set in batches and accumulate the metrics, so peak memory
+    # stays bounded by the batch size rather than the dataset size
+    fixed_batch = model_input.shape[0] if isinstance(model_input.shape[0], int) and model_input.shape[0] > 0 else None
+    batch_size = fixed_batch or EVAL_BATCH_SIZE
+
+    for start in range(0, len(data), batch_size):
+        X_batch = data.X[start:start + batch_size]
+        rows = len(X_batch)
+        if fixed_batch and rows < fixed_batch:
+            # Pad the last batch up to the model's fixed batch dimension
+            padding = np.zeros((fixed_batch - rows,) + X_batch.shape[1:], dtype=np.float32)
+            X_batch = np.concatenate([X_batch, padding])
+
+        outputs = sess.run(fetch, {input_name: np.ascontiguousarray(X_batch)})
+        probabilities = None
+        if len(outputs) > 1:
+            probabilities = outputs[1][:rows]
+            if len(probabilities) and isinstance(probabilities[0], dict):
+                # skl2onnx "zipmap" output: list of {label: probability}
+                probabilities = np.array([[p[k] for k in sorted(p)] for p in probabilities])
+        scores.update(y_test[start:start + rows], outputs[0][:rows], probabilities)
+
+    return scores.result()
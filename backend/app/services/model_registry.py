@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+
+# ML Model for PPT evaluation
+PITCH_MODEL_PATH = os.getenv("PITCH_MODEL_PATH", r"D:\Projects\Hacklens\backend\app\ml_model\pitch_model.pkl")
+SBERT_MODEL_NAME = os.getenv("SBERT_MODEL_NAME", "all-MiniLM-L6-v2")
+# Load every model in the background at startup instead of on first use
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "false").lower() in ("1", "true", "yes")
+
+
+class ModelRegistry:
+    """Loads shared ML models on first use and keeps one instance per process.
+
+    Loading is guarded per model, so concurrent first requests wait for a single
+    load. A failed load is reported in `status()` and retried on the next `get()`.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+        self._state = {}
+
+    def register(self, name: str, loader):
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+        self._state[name] = {"status": "not_loaded", "load_seconds": None, "error": None}
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+
+            self._state[name].update(status="loading", error=None)
+            started = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._state[name].update(status="failed", error=str(e))
+                raise RuntimeError(f"Model '{name}' could not be loaded: {e}")
+
+            self._models[name] = model
+            self._state[name].update(status="ready", load_seconds=round(time.perf_counter() - started, 2))
+            return model
+
+    def preload(self):
+        """Loads every registered model in a background thread."""
+        def load_all():
+            for name in self._loaders:
+                try:
+                    self.get(name)
+                except RuntimeError as e:
+                    print(f"⚠️ {e}")
+        threading.Thread(target=load_all, daemon=True).start()
+
+    def ready(self) -> bool:
+        return all(state["status"] == "ready" for state in self._state.values())
+
+    def status(self) -> dict:
+        return {name: dict(state) for name, state in self._state.items()}
+
+
+def _load_pitch_model():
+    import joblib
+    return joblib.load(PITCH_MODEL_PATH)
+
+
+def _load_sbert():
+    # Imported lazily: sentence-transformers pulls in torch
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(SBERT_MODEL_NAME)
+
+
+model_registry = ModelRegistry()
+model_registry.register("pitch_model", _load_pitch_model)
+model_registry.register("sbert", _load_sbert)
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import onnxruntime as ort
+
+ONNX_SESSION_CACHE_SIZE = int(os.getenv("ONNX_SESSION_CACHE_SIZE", 16))
+# Approximate memory budget; each session is weighted by its model file size
+ONNX_SESSION_CACHE_MAX_MB = int(os.getenv("ONNX_SESSION_CACHE_MAX_MB", 1024))
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", 0))   # 0 = onnxruntime default
+ONNX_INTER_OP_THREADS = int(os.getenv("ONNX_INTER_OP_THREADS", 0))
+ONNX_GRAPH_OPTIMIZATION = os.getenv("ONNX_GRAPH_OPTIMIZATION", "all")
+# When set, optimized models are saved here and later loads skip graph optimization
+ONNX_OPTIMIZED_MODEL_DIR = os.getenv("ONNX_OPTIMIZED_MODEL_DIR", "")
+
+_OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SessionCache:
+    """LRU cache of onnxruntime InferenceSessions keyed by model content hash.
+
+    Bounded by number of sessions and by (approximate) memory, so re-evaluating
+    the same .onnx file skips parsing and graph optimization.
+    """
+
+    def __init__(self, max_sessions: int = ONNX_SESSION_CACHE_SIZE,
+                 max_bytes: int = ONNX_SESSION_CACHE_MAX_MB * 1024 * 1024,
+                 intra_op_threads: int = ONNX_INTRA_OP_THREADS,
+                 inter_op_threads: int = ONNX_INTER_OP_THREADS,
+                 optimization: str = ONNX_GRAPH_OPTIMIZATION,
+                 optimized_dir: str = ONNX_OPTIMIZED_MODEL_DIR):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.optimization_level = _OPTIMIZATION_LEVELS.get(optimization.lower(), ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+        self.optimized_dir = optimized_dir
+
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._sessions = OrderedDict()   # key -> (session, weight)
+        self._size = 0
+        self._hashes = OrderedDict()     # (path, mtime, size) -> sha256, LRU like the sessions
+        self.hits = 0
+        self.misses = 0
+
+        if self.optimized_dir:
+            os.makedirs(self.optimized_dir, exist_ok=True)
+
+    def model_key(self, file_path: str) -> str:
+        """Content hash of the model, memoized per (path, mtime, size)."""
+        st = os.stat(file_path)
+        stamp = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            key = self._hashes.get(stamp)
+            if key is not None:
+                self._hashes.move_to_end(stamp)
+                return key
+        key = file_sha256(file_path)
+        with self._lock:
+            # Temp uploads get a new path every time, so keep only as many as sessions
+            self._hashes[stamp] = key
+            while len(self._hashes) > self.max_sessions:
+                self._hashes.popitem(last=False)
+        return key
+
+    def _options(self, pre_optimized: bool) -> ort.SessionOptions:
+        options = ort.SessionOptions()
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        if self.inter_op_threads:
+            options.inter_op_num_threads = self.inter_op_threads
+        options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_DISABLE_ALL if pre_optimized else self.optimization_level
+        )
+        return options
+
+    def _build(self, file_path: str, key: str):
+        if not self.optimized_dir:
+            return ort.InferenceSession(file_path, self._options(False), providers=["CPUExecutionProvider"])
+
+        optimized_path = os.path.join(self.optimized_dir, f"{key}.onnx")
+        if os.path.exists(optimized_path):
+            try:
+                return ort.InferenceSession(optimized_path, self._options(True), providers=["CPUExecutionProvider"])
+            except Exception:
+                os.remove(optimized_path)   # stale/corrupt, rebuild below
+
+        options = self._options(False)
+        options.optimized_model_filepath = optimized_path
+        return ort.InferenceSession(file_path, options, providers=["CPUExecutionProvider"])
+
+    def get(self, file_path: str) -> ort.InferenceSession:
+        key = self.model_key(file_path)
+
+        with self._lock:
+            if key in self._sessions:
+                self._sessions.move_to_end(key)
+                self.hits += 1
+                return self._sessions[key][0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only one thread builds a given model; others wait and reuse it
+        with key_lock:
+            with self._lock:
+                if key in self._sessions:
+                    self.hits += 1
+                    return self._sessions[key][0]
+                self.misses += 1
+
+            session = self._build(file_path, key)
+            weight = os.path.getsize(file_path)
+
+            with self._lock:
+                self._sessions[key] = (session, weight)
+                self._size += weight
+                while self._sessions and (
+                    len(self._sessions) > self.max_sessions or self._size > self.max_bytes
+                ):
+                    old_key, (_, old_weight) = self._sessions.popitem(last=False)
+                    self._size -= old_weight
+                    if old_key == key:
+                        break
+                self._key_locks.pop(key, None)
+        return session
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self._size,
+                "hashes": len(self._hashes),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+sessions = SessionCache()
@@ -0,0 +1,48 @@
+import re
+
+# Keyword groups looked for in a deck. `feature` groups feed the pitch model (in
+# this order - it must match the features the model was trained on); `feedback`
+# is shown when the group is missing. Adding a group only needs an entry here.
+KEYWORD_GROUPS = [
+    {"name": "problem", "pattern": r"problem", "feature": True,
+     "feedback": "Add a clear 'Problem Statement' section."},
+    {"name": "solution", "pattern": r"solution", "feature": True,
+     "feedback": "Include a concise 'Solution' slide."},
+    {"name": "tech", "pattern": r"tech|technology|stack", "feature": True,
+     "feedback": "Describe your technology stack clearly."},
+    {"name": "future", "pattern": r"future|scope|next", "feature": True,
+     "feedback": "Mention the 'Future Scope' or roadmap."},
+    {"name": "demo", "pattern": r"demo|prototype|working", "feature": True,
+     "feedback": "Add a demo/prototype explanation slide."},
+]
+ALL_GOOD_FEEDBACK = "Looks well-balanced! Great job."
+
+FEATURE_GROUPS = [group["name"] for group in KEYWORD_GROUPS if group.get("feature")]
+
+# One pattern for all groups, compiled once. It stops at every position where some
+# group matches and, since each group sits in its own lookahead, records every group
+# matching there. Matches may overlap ("nextech" → next, tech), as with one search per group.
+_COMBINED = re.compile(
+    "(?=" + "|".join(f"(?:{group['pattern']})" for group in KEYWORD_GROUPS) + ")"
+    + "".join(f"(?:(?=(?P<{group['name']}>{group['pattern']})))?" for group in KEYWORD_GROUPS),
+    re.IGNORECASE,
+)
+
+
+def find_keywords(text: str) -> set:
+    """Names of the keyword groups present in `text`, found in a single scan."""
+    found = set()
+    for match in _COMBINED.finditer(text):
+        found.update(name for name, value in match.groupdict().items() if value is not None)
+        if len(found) == len(KEYWORD_GROUPS):
+            break
+    return found
+
+
+def keyword_features(found: set) -> list:
+    return [int(name in found) for name in FEATURE_GROUPS]
+
+
+def keyword_feedback(found: set) -> list:
+    feedback = [group["feedback"] for group in KEYWORD_GROUPS if group["name"] not in found and group.get("feedback")]
+    return feedback or [ALL_GOOD_FEEDBACK]
@@ -0,0 +1,142 @@
+import os
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import textstat
+
+from app.services.embedding_cache import embeddings
+from app.services.model_registry import model_registry
+from app.services.pitch_keywords import find_keywords, keyword_features, keyword_feedback
+
+MAX_PPT_UPLOAD_BYTES = int(os.getenv("MAX_PPT_UPLOAD_BYTES", 50 * 1024 * 1024))
+MAX_SLIDE_XML_BYTES = int(os.getenv("MAX_SLIDE_XML_BYTES", 5 * 1024 * 1024))   # uncompressed, per slide
+MAX_PPT_BATCH_FILES = int(os.getenv("MAX_PPT_BATCH_FILES", 50))                # decks per /predict-ppt/batch
+MAX_PPT_BATCH_BYTES = int(os.getenv("MAX_PPT_BATCH_BYTES", 500 * 1024 * 1024))  # whole /predict-ppt/batch body
+
+_NS = {
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+
+class DeckError(ValueError):
+    pass
+
+
+class DeckTooLarge(DeckError):
+    pass
+
+
+def _read_part(zf: zipfile.ZipFile, name: str, limit: int) -> ET.Element:
+    try:
+        info = zf.getinfo(name)
+    except KeyError:
+        raise DeckError(f"Missing part {name}")
+    if info.file_size > limit:
+        raise DeckTooLarge(f"{name} is larger than {limit // 1024} KB uncompressed")
+    with zf.open(info) as part:
+        return ET.parse(part).getroot()
+
+
+def _slide_parts(zf: zipfile.ZipFile) -> list:
+    """Slide part names in presentation order (sldIdLst), as python-pptx lists them."""
+    presentation = _read_part(zf, "ppt/presentation.xml", MAX_SLIDE_XML_BYTES)
+    rels = _read_part(zf, "ppt/_rels/presentation.xml.rels", MAX_SLIDE_XML_BYTES)
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.findall("rel:Relationship", _NS)}
+
+    parts = []
+    for sld_id in presentation.findall("p:sldIdLst/p:sldId", _NS):
+        target = targets.get(sld_id.get(f"{{{_NS['r']}}}id"))
+        if target:
+            parts.append(posixpath.normpath(posixpath.join("ppt", target)).lstrip("/"))
+    return parts
+
+
+def _shape_text(sp: ET.Element) -> str:
+    paragraphs = []
+    for para in sp.findall("p:txBody/a:p", _NS):
+        pieces = []
+        for child in para:
+            if child.tag in (f"{{{_NS['a']}}}r", f"{{{_NS['a']}}}fld"):
+                pieces.append(child.findtext("a:t", "", _NS))
+            elif child.tag == f"{{{_NS['a']}}}br":
+                pieces.append("\v")
+        paragraphs.append("".join(pieces))
+    return "\n".join(paragraphs)
+
+
+# PPT Evaluation Helpers
+def extract_text_from_ppt(source):
+    """Returns (slide_count, joined slide text) for a .pptx path or seekable file-like object.
+
+    Only the presentation index and slide XML parts are read from the zip, one at
+    a time, so uploads can be scored straight from the in-memory/spooled buffer.
+    """
+    if hasattr(source, "seek"):
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        source.seek(0)
+    else:
+        size = os.path.getsize(source)
+    if size > MAX_PPT_UPLOAD_BYTES:
+        raise DeckTooLarge(f"Deck is larger than {MAX_PPT_UPLOAD_BYTES // (1024 * 1024)} MB")
+
+    try:
+        with zipfile.ZipFile(source) as zf:
+            slides = _slide_parts(zf)
+            all_text = []
+            for name in slides:
+                tree = _read_part(zf, name, MAX_SLIDE_XML_BYTES)
+                # Top-level text shapes only, matching python-pptx's slide.shapes[*].text
+                for sp in tree.findall("p:cSld/p:spTree/p:sp", _NS):
+                    text = _shape_text(sp).strip()
+                    if text:
+                        all_text.append(text)
+    except (zipfile.BadZipFile, ET.ParseError) as e:
+        raise DeckError(f"Not a valid .pptx file: {e}")
+    return len(slides), " ".join(all_text)
+
+
+def build_features(slide_count: int, joined_text: str, embedding, found: set = None) -> list:
+    word_count = len(joined_text.split())
+    avg_words_per_slide = word_count / slide_count if slide_count else 0
+    readability = textstat.flesch_reading_ease(joined_text)
+    if found is None:
+        found = find_keywords(joined_text)
+
+    return [
+        slide_count, word_count, avg_words_per_slide, readability,
+    ] + keyword_features(found) + np.asarray(embedding).tolist()
+
+
+def score_decks(decks: list) -> list:
+    """Scores many decks at once from [(slide_count, joined_text), ...].
+
+    All texts are embedded in one batched encode (cached by text hash) and the
+    pitch model predicts over the stacked feature matrix.
+    """
+    if not decks:
+        return []
+    model = model_registry.get("pitch_model")
+    vectors = embeddings.encode_many(model_registry.get("sbert"), [text for _, text in decks])
+
+    found = [find_keywords(text) for _, text in decks]
+    X = np.array([
+        build_features(slide_count, text, vector, keywords)
+        for (slide_count, text), vector, keywords in zip(decks, vectors, found)
+    ])
+    scores = model.predict(X)
+
+    results = []
+    for keywords, score in zip(found, scores):
+        score_10 = float(score)
+        results.append({
+            "score_out_of_10": round(score_10, 2),
+            "score_out_of_100": round(score_10 * 10, 2),
+            "feedback": keyword_feedback(keywords),
+        })
+    return results
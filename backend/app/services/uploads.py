@@ -0,0 +1,52 @@
+import hashlib
+import os
+
+import anyio
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))   # 1 MiB
+
+# Max submission size per hackathon type (MB)
+UPLOAD_LIMITS_MB = {
+    "ml_hackathon": int(os.getenv("UPLOAD_LIMIT_ML_MB", 500)),       # ONNX models
+    "codeathon": int(os.getenv("UPLOAD_LIMIT_CODE_MB", 5)),          # source files
+    "hackathon": int(os.getenv("UPLOAD_LIMIT_HACKATHON_MB", 50)),    # Dockerfiles / decks
+}
+DEFAULT_UPLOAD_LIMIT_MB = int(os.getenv("UPLOAD_LIMIT_DEFAULT_MB", 50))
+# Largest limit of any type; enforced on the request body before the hackathon is known
+MAX_UPLOAD_BYTES = max(list(UPLOAD_LIMITS_MB.values()) + [DEFAULT_UPLOAD_LIMIT_MB]) * 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def upload_limit(hackathon_type: str) -> int:
+    return UPLOAD_LIMITS_MB.get(hackathon_type, DEFAULT_UPLOAD_LIMIT_MB) * 1024 * 1024
+
+
+async def save_upload(upload: UploadFile, path: str, max_bytes: int):
+    """Streams an upload to `path` in fixed-size chunks, hashing as it goes.
+
+    Returns (size in bytes, sha256 hex). The file is written under a temporary
+    name and only moved into place once complete; on error nothing is left behind.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+
+    tmp_path = f"{path}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as out:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+                digest.update(chunk)
+                await out.write(chunk)
+        await anyio.Path(tmp_path).replace(path)
+    except BaseException:
+        await anyio.Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
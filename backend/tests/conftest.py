@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Make the `app` package importable when running `pytest` from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# JWT settings normally come from .env
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
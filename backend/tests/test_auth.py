@@ -0,0 +1,49 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.core.user_cache import UserCache
+from app.routes import users
+
+app = FastAPI()
+app.include_router(users.router, prefix="/users")
+client = TestClient(app)
+
+
+def _token(role, **claims):
+    data = {"sub": "ana", "role": role, "name": "Ana", "iat": int(time.time()), **claims}
+    return {"Authorization": f"Bearer {create_access_token(data=data)}"}
+
+
+def test_fresh_token_claims_are_trusted_without_a_database():
+    response = client.get("/users/participant-dashboard", headers=_token("participant"))
+    assert response.status_code == 200
+    assert response.json() == {"message": "Welcome to your dashboard, Participant Ana!"}
+
+
+def test_claims_with_the_wrong_role_are_refused():
+    assert client.get("/users/admin-panel", headers=_token("participant")).status_code == 403
+
+
+def test_disabled_claims_are_refused():
+    assert client.get("/users/judge-dashboard", headers=_token("judge", disabled=True)).status_code == 403
+
+
+def test_user_cache_expires_and_invalidates():
+    cache = UserCache(ttl=60, max_entries=2)
+    cache.put("ana", "user-a")
+    assert cache.get("ana") == "user-a"
+    cache.invalidate("ana")
+    assert cache.get("ana") is None
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)   # evicts the least recently used
+    assert cache.get("a") is None and cache.get("c") == 3
+
+    expired = UserCache(ttl=0.01)
+    expired.put("ana", "user-a")
+    time.sleep(0.02)
+    assert expired.get("ana") is None
@@ -0,0 +1,62 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.body_limit import BodyLimitMiddleware
+
+app = FastAPI()
+app.add_middleware(BodyLimitMiddleware, limits={"/upload": 1024})
+reached = []
+
+
+@app.post("/upload")
+async def upload(file: UploadFile = File(...)):
+    reached.append(file.filename)
+    return {"size": len(await file.read())}
+
+
+@app.post("/other")
+async def other(file: UploadFile = File(...)):
+    return {"size": len(await file.read())}
+
+
+client = TestClient(app)
+
+
+def test_small_upload_passes():
+    response = client.post("/upload", files={"file": ("a.bin", b"x" * 100)})
+    assert response.status_code == 200 and response.json() == {"size": 100}
+
+
+def test_rejected_by_content_length():
+    reached.clear()
+    response = client.post("/upload", files={"file": ("a.bin", b"x" * 5000)})
+    assert response.status_code == 413
+    assert reached == []
+
+
+def test_rejected_while_streaming_without_content_length():
+    reached.clear()
+
+    def chunks():
+        yield b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.bin\"\r\n\r\n"
+        for _ in range(10):
+            yield b"x" * 512
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert reached == []
+
+
+def test_other_paths_are_not_limited():
+    response = client.post("/other", files={"file": ("a.bin", b"x" * 5000)})
+    assert response.status_code == 200
+
+
+def test_prefix_and_exact_limits():
+    middleware = BodyLimitMiddleware(None, limits={"/submit/": 10, "/submit/big": 20, "/a": 1, "/a/b/": 2})
+    assert middleware.limit_for("/submit/123") == 10
+    assert middleware.limit_for("/submit/big") == 20
+    assert middleware.limit_for("/submit") is None
+    assert middleware.limit_for("/a/b/c") == 2
+    assert middleware.limit_for("/other") is None
@@ -0,0 +1,34 @@
+from app.services.compile_cache import CompileCache
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = CompileCache(directory=str(tmp_path), max_bytes=1024)
+    key = CompileCache.key("sha256:img", "cpp", "int main(){}")
+    assert cache.get(key) is None
+    cache.put(key, b"artifact")
+    assert cache.get(key) == b"artifact"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_key_depends_on_image_language_and_code():
+    base = CompileCache.key("img", "cpp", "x")
+    assert base != CompileCache.key("img2", "cpp", "x")
+    assert base != CompileCache.key("img", "java", "x")
+    assert base != CompileCache.key("img", "cpp", "y")
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = CompileCache(directory=str(tmp_path), max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")                 # "b" is now the oldest
+    cache.put("c", b"12345")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.get("c") == b"12345"
+
+
+def test_reloads_entries_from_disk(tmp_path):
+    CompileCache(directory=str(tmp_path)).put("k", b"data")
+    assert CompileCache(directory=str(tmp_path)).get("k") == b"data"
+
@@ -0,0 +1,99 @@
+import itertools
+import threading
+import time
+
+from app.services.container_pool import ContainerPool
+
+
+class FakeContainer:
+    def __init__(self, container_id):
+        self.id = container_id
+        self.removed = False
+
+    def start(self):
+        pass
+
+    def exec_run(self, cmd, **kwargs):
+        return 0, b""
+
+    def remove(self, force=False):
+        self.removed = True
+
+
+class FakeClient:
+    """Docker client whose containers take `delay` seconds to create."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.created = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.containers = self
+
+    def create(self, **kwargs):
+        time.sleep(self.delay)
+        with self._lock:
+            container = FakeContainer(f"c{next(self._ids)}")
+            self.created.append(container)
+        return container
+
+
+class FakeImages:
+    def ensure(self, image):
+        return "sha256:image"
+
+
+def _wait_for_idle(pool, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while pool.stats()["idle"] < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pool.stats()["idle"]
+
+
+def test_fill_creates_the_warm_set_in_parallel():
+    client = FakeClient(delay=0.3)
+    pool = ContainerPool(client, "img", FakeImages(), min_size=4, max_size=8, max_uses=1)
+    started = time.monotonic()
+    pool.fill()
+    assert _wait_for_idle(pool, 4) == 4
+    assert time.monotonic() - started < 1.0     # four creations overlapped
+    pool.fill()                                  # already full: nothing more
+    assert len(client.created) == 4
+    pool.close()
+
+
+def test_concurrent_acquires_are_served_from_the_warm_set():
+    client = FakeClient(delay=0.05)
+    pool = ContainerPool(client, "img", FakeImages(), min_size=3, max_size=6, max_uses=1)
+    pool.fill()
+    _wait_for_idle(pool, 3)
+
+    client.delay = 1.0   # anything created on the request path would now be slow
+    started = time.monotonic()
+    leased = [pool.acquire() for _ in range(3)]
+    assert time.monotonic() - started < 0.5
+
+    for container in leased:
+        pool.release(container)
+    assert _wait_for_removed(leased)              # max_uses=1: never reused
+    assert _wait_for_idle(pool, 3) == 3          # refilled in the background
+    assert pool.stats()["total"] <= 6
+    pool.close()
+
+
+def _wait_for_removed(containers, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not all(c.removed for c in containers) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return all(c.removed for c in containers)
+
+
+def test_reused_containers_go_back_to_the_idle_set():
+    pool = ContainerPool(FakeClient(delay=0), "img", FakeImages(), min_size=1, max_size=2, max_uses=3)
+    pool.fill()
+    _wait_for_idle(pool, 1)
+    container = pool.acquire()
+    pool.release(container)
+    assert not container.removed
+    assert {pool.acquire().id, pool.acquire().id} >= {container.id}
+    pool.close()
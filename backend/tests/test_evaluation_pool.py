@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.evaluation_pool import EvaluationPool, EvaluationTimeout
+
+
+def test_timeout_only_kills_the_hanging_worker():
+    async def scenario():
+        pool = EvaluationPool(workers=2, timeout=5, memory_limit_mb=0)
+        try:
+            # Warm both workers so the slow job below is already running when the hang is detected
+            await asyncio.gather(pool.run(pow, 2, 3), pool.run(pow, 2, 4))
+            hanging = asyncio.create_task(pool.run(time.sleep, 30, timeout=1))
+            slow = asyncio.create_task(pool.run(time.sleep, 2))
+            with pytest.raises(EvaluationTimeout):
+                await hanging
+            assert await slow is None           # unaffected by the other worker being killed
+            assert await pool.run(pow, 2, 10) == 1024
+            return pool.stats()
+        finally:
+            pool.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert stats["restarts"] == 1
+    assert stats["failed"] == 1
+
+
+def test_job_exceptions_keep_the_worker():
+    async def scenario():
+        pool = EvaluationPool(workers=1, timeout=10, memory_limit_mb=0)
+        try:
+            with pytest.raises(ZeroDivisionError):
+                await pool.run(divmod, 1, 0)
+            assert await pool.run(divmod, 7, 2) == (3, 1)
+            return pool.stats()
+        finally:
+            pool.shutdown()
+
+    assert asyncio.run(scenario())["restarts"] == 0
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.explanations import ExplanationProvider, ExplanationService
+
+INPUTS = {"hackathon_type": "ml_hackathon", "metrics": {"accuracy": 0.9}, "participant": "ana", "code_preview": ""}
+
+
+class SlowProvider(ExplanationProvider):
+    name = "slow"
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, inputs):
+        with self._lock:
+            self.calls += 1
+        threading.Event().wait(self.delay)
+        return f"summary for {inputs['participant']}"
+
+
+class FailingProvider(ExplanationProvider):
+    name = "failing"
+
+    def generate(self, inputs):
+        raise RuntimeError("provider down")
+
+
+def test_provider_must_implement_generate():
+    class Incomplete(ExplanationProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_identical_requests_share_one_call_and_are_cached():
+    provider = SlowProvider()
+    service = ExplanationService(provider)
+
+    async def scenario():
+        results = await asyncio.gather(*(service.explain(INPUTS) for _ in range(5)))
+        results.append(await service.explain(INPUTS))
+        return results
+
+    results = asyncio.run(scenario())
+    assert set(results) == {"summary for ana"}
+    assert provider.calls == 1
+    assert service.coalesced == 4 and service.hits == 1
+
+
+def test_waiters_finish_when_the_first_caller_is_cancelled():
+    provider = SlowProvider()
+    service = ExplanationService(provider)
+
+    async def scenario():
+        first = asyncio.create_task(service.explain(INPUTS))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(service.explain(INPUTS))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        return await asyncio.wait_for(waiter, 5)
+
+    assert asyncio.run(scenario()) == "summary for ana"
+    assert provider.calls == 2   # the waiter made its own call
+    assert service.stats()["in_flight"] == 0
+
+
+def test_provider_errors_fall_back_without_caching():
+    service = ExplanationService(FailingProvider())
+
+    async def scenario():
+        return await service.explain(INPUTS), await service.explain(INPUTS)
+
+    first, second = asyncio.run(scenario())
+    assert first.startswith("1. Overall Summary") and first == second
+    assert service.stats()["cached"] == 0
+    assert service.latency["failing"]["failures"] == 2
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+from app.services import hidden_test_sets
+
+
+@pytest.mark.parametrize("hackathon_id", ["../etc", "a/b", "..", "", "id with space", "x\\y"])
+def test_rejects_ids_that_are_not_plain(hackathon_id):
+    with pytest.raises(ValueError):
+        hidden_test_sets.validate_hackathon_id(hackathon_id)
+
+
+def test_accepts_object_ids_and_slugs():
+    assert hidden_test_sets.validate_hackathon_id("65f0c2a1b2c3d4e5f6a7b8c9") == "65f0c2a1b2c3d4e5f6a7b8c9"
+    assert hidden_test_sets.validate_hackathon_id("spring_2024-ml") == "spring_2024-ml"
+
+
+def test_dataset_path_never_leaves_test_data_dir():
+    with pytest.raises(ValueError):
+        hidden_test_sets.dataset_path("../../secrets")
+
+
+def _write_csv(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("a,b,target\n" + "\n".join(f"{i},{i * 2},{i % 2}" for i in range(rows)) + "\n")
+
+
+def test_cache_of_one_hackathon_survives_loading_another(tmp_path, monkeypatch):
+    monkeypatch.setattr(hidden_test_sets, "TEST_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(hidden_test_sets, "TEST_DATA_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(hidden_test_sets, "TEST_DATA_PATH", str(tmp_path / "default.csv"))
+    monkeypatch.setattr(hidden_test_sets, "_loaded", {})
+    # "abc" is a prefix of "abc-2" and "default" is the name of the default set's cache
+    for hackathon_id, rows in (("abc-2", 3), ("abc", 4), ("default", 5)):
+        _write_csv(tmp_path / "data" / hackathon_id / "test.csv", rows)
+    _write_csv(tmp_path / "default.csv", 6)
+
+    sizes = {hid: len(hidden_test_sets.load_test_data(hid)) for hid in ("abc-2", "abc", "default", None)}
+    assert sizes == {"abc-2": 3, "abc": 4, "default": 5, None: 6}
+
+    hidden_test_sets._loaded.clear()   # force reading the .npy files back
+    assert len(hidden_test_sets.load_test_data("abc-2")) == 3
+    assert len(list((tmp_path / "cache" / "hackathons" / "abc-2").iterdir())) == 2
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import pytest
+from docker.errors import ImageNotFound
+
+from app.services.image_cache import ImageCache
+
+
+class FlakyImages:
+    """Image API that is unreachable until `online` is set."""
+
+    def __init__(self):
+        self.online = False
+        self.pulls = 0
+
+    def get(self, image):
+        raise ImageNotFound(image)
+
+    def pull(self, image):
+        self.pulls += 1
+        if not self.online:
+            raise ConnectionError("registry unreachable")
+        return SimpleNamespace(id="sha256:abc")
+
+
+def test_failed_resolves_are_not_retried_within_the_backoff():
+    images = FlakyImages()
+    cache = ImageCache(SimpleNamespace(images=images), ["python:3.11-slim"], retry_after=60)
+
+    for _ in range(5):
+        with pytest.raises(RuntimeError, match="registry unreachable"):
+            cache.ensure("python:3.11-slim")
+    assert images.pulls == 1
+
+    images.online = True
+    cache._retry_at["python:3.11-slim"] = 0   # backoff elapsed
+    assert cache.ensure("python:3.11-slim") == "sha256:abc"
+    assert images.pulls == 2
+    assert cache.ensure("python:3.11-slim") == "sha256:abc"
+    assert images.pulls == 2
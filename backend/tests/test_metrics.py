@@ -0,0 +1,189 @@
+import numpy as np
+import pytest
+
+from app.services.metrics import (
+    ConfusionMatrix,
+    MetricsAccumulator,
+    ScoreSample,
+    class_predictions,
+    classification_metrics,
+    roc_auc,
+)
+
+sklearn_metrics = pytest.importorskip("sklearn.metrics")
+
+
+def _sklearn_classification(y_true, y_pred):
+    return {
+        "accuracy": sklearn_metrics.accuracy_score(y_true, y_pred),
+        "precision": sklearn_metrics.precision_score(y_true, y_pred, average="weighted", zero_division=0),
+        "recall": sklearn_metrics.recall_score(y_true, y_pred, average="weighted", zero_division=0),
+        "f1_score": sklearn_metrics.f1_score(y_true, y_pred, average="weighted", zero_division=0),
+        "precision_macro": sklearn_metrics.precision_score(y_true, y_pred, average="macro", zero_division=0),
+        "recall_macro": sklearn_metrics.recall_score(y_true, y_pred, average="macro", zero_division=0),
+        "f1_macro": sklearn_metrics.f1_score(y_true, y_pred, average="macro", zero_division=0),
+    }
+
+
+@pytest.mark.parametrize("n_classes", [2, 3, 7])
+def test_batched_confusion_matrix_matches_sklearn(n_classes):
+    rng = np.random.default_rng(n_classes)
+    y_true = rng.integers(0, n_classes, 5000)
+    # Some classes are never predicted and one is predicted but never true
+    y_pred = np.where(rng.random(5000) < 0.6, y_true, rng.integers(1, n_classes + 1, 5000))
+
+    cm = ConfusionMatrix()
+    for start in range(0, len(y_true), 777):
+        cm.update(y_true[start:start + 777], y_pred[start:start + 777])
+
+    assert cm.total == len(y_true)
+    ours = classification_metrics(cm)
+    for name, expected in _sklearn_classification(y_true, y_pred).items():
+        assert ours[name] == pytest.approx(expected), name
+
+
+def test_string_labels_match_sklearn():
+    y_true = np.array(["cat", "dog", "dog", "bird", "cat", "dog"])
+    y_pred = np.array(["cat", "dog", "cat", "dog", "cat", "fish"])
+    cm = ConfusionMatrix()
+    cm.update(y_true[:3], y_pred[:3])
+    cm.update(y_true[3:], y_pred[3:])
+    ours = classification_metrics(cm)
+    for name, expected in _sklearn_classification(y_true, y_pred).items():
+        assert ours[name] == pytest.approx(expected), name
+
+
+def test_class_predictions():
+    assert class_predictions(np.array([[0.1, 0.9], [0.8, 0.2]])).tolist() == [1, 0]
+    assert class_predictions(np.array([[0.2], [0.5], [0.7]], dtype=np.float32)).tolist() == [0, 1, 1]
+    assert class_predictions(np.array([2.0, 0.0, 1.0])).tolist() == [2, 0, 1]
+    assert class_predictions(np.array([3, 1], dtype=np.int64)).tolist() == [3, 1]
+
+
+def test_fractional_label_vector_is_rejected():
+    with pytest.raises(ValueError, match="non-integer"):
+        class_predictions(np.array([0.2, 0.7, 1.0]))
+
+
+def test_too_many_labels_is_rejected():
+    cm = ConfusionMatrix(max_labels=10)
+    cm.update(np.arange(5), np.arange(5))
+    with pytest.raises(ValueError, match="distinct labels"):
+        cm.update(np.arange(5), np.arange(5, 11))
+
+
+def test_sigmoid_column_is_thresholded():
+    y_true = np.array([0, 1, 1, 0, 1])
+    probabilities = np.array([[0.1], [0.9], [0.4], [0.6], [0.5]], dtype=np.float32)
+    acc = MetricsAccumulator(["accuracy"])
+    acc.update(y_true, probabilities)
+    assert acc.result()["accuracy"] == pytest.approx(sklearn_metrics.accuracy_score(y_true, [0, 1, 0, 1, 1]))
+
+
+def test_binary_roc_auc_matches_sklearn_with_ties():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 2000)
+    scores = np.round(rng.random(2000) * 0.5 + y_true * 0.3, 2)   # rounded → many ties
+    ours = roc_auc(y_true, scores)
+    assert ours == pytest.approx(sklearn_metrics.roc_auc_score(y_true, scores))
+    # Two-column probabilities use the positive column
+    two_columns = np.stack([1 - scores, scores], axis=1)
+    assert roc_auc(y_true, two_columns) == pytest.approx(ours)
+
+
+def test_multiclass_roc_auc_matches_sklearn_ovr_macro():
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 4, 3000)
+    logits = rng.random((3000, 4)) + np.eye(4)[y_true] * 0.5
+    probabilities = logits / logits.sum(axis=1, keepdims=True)
+    expected = sklearn_metrics.roc_auc_score(y_true, probabilities, multi_class="ovr", average="macro")
+    assert roc_auc(y_true, probabilities) == pytest.approx(expected)
+
+
+def test_roc_auc_is_none_for_a_single_class():
+    assert roc_auc(np.ones(5, dtype=int), np.linspace(0, 1, 5)) is None
+
+
+def test_accumulator_matches_sklearn_across_batches():
+    rng = np.random.default_rng(2)
+    y_true = rng.integers(0, 3, 4000)
+    probabilities = rng.random((4000, 3)) + np.eye(3)[y_true] * 0.4
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    metrics = ["accuracy", "precision", "recall", "f1_score", "f1_macro", "roc_auc", "rmse", "mae"]
+
+    acc = MetricsAccumulator(metrics)
+    for start in range(0, len(y_true), 1000):
+        acc.update(y_true[start:start + 1000], probabilities[start:start + 1000])
+    report = acc.result()
+
+    y_pred = np.argmax(probabilities, axis=1)
+    expected = _sklearn_classification(y_true, y_pred)
+    for name in ("accuracy", "precision", "recall", "f1_score", "f1_macro"):
+        assert report[name] == pytest.approx(expected[name]), name
+    assert report["roc_auc"] == pytest.approx(
+        sklearn_metrics.roc_auc_score(y_true, probabilities, multi_class="ovr", average="macro")
+    )
+    # Regression metrics use the first output column
+    assert report["rmse"] == pytest.approx(np.sqrt(sklearn_metrics.mean_squared_error(y_true, probabilities[:, 0])))
+    assert report["mae"] == pytest.approx(sklearn_metrics.mean_absolute_error(y_true, probabilities[:, 0]))
+    assert report["final_combined_score"] == pytest.approx(
+        0.4 * expected["accuracy"] + 0.2 * (expected["precision"] + expected["recall"] + expected["f1_score"])
+    )
+
+
+def test_unknown_metrics_fall_back_to_defaults():
+    acc = MetricsAccumulator(["nonsense"])
+    assert acc.metrics == ["accuracy", "precision", "recall", "f1_score"]
+
+
+def test_multiclass_labels_are_mapped_to_score_columns():
+    rng = np.random.default_rng(3)
+    labels = np.array([10, 20, 30])
+    y_true = labels[rng.integers(0, 3, 2000)]
+    probabilities = rng.random((2000, 3)) + (y_true[:, None] == labels) * 0.5
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    expected = sklearn_metrics.roc_auc_score(y_true, probabilities, multi_class="ovr", average="macro")
+    assert roc_auc(y_true, probabilities) == pytest.approx(expected)
+
+
+def test_two_column_scores_use_the_larger_label_as_positive():
+    rng = np.random.default_rng(4)
+    y_true = np.where(rng.random(1000) < 0.5, "spam", "ham")
+    p_spam = np.clip(rng.random(1000) * 0.6 + (y_true == "spam") * 0.3, 0, 1)
+    two_columns = np.stack([1 - p_spam, p_spam], axis=1)   # classes sorted: ham, spam
+    assert roc_auc(y_true, two_columns) == pytest.approx(sklearn_metrics.roc_auc_score(y_true == "spam", p_spam))
+
+
+def test_labels_that_cannot_match_the_columns_are_rejected():
+    with pytest.raises(ValueError, match="score columns"):
+        roc_auc(np.array([1, 5, 7, 9]), np.random.default_rng(0).random((4, 3)))
+    with pytest.raises(ValueError, match="binary target"):
+        roc_auc(np.array([0, 1, 2]), np.array([0.1, 0.5, 0.9]))
+
+
+def test_score_sample_is_bounded_and_unbiased():
+    rng = np.random.default_rng(5)
+    y_true = rng.integers(0, 2, 50_000)
+    scores = rng.random(50_000) + y_true * 0.4
+
+    sample = ScoreSample(capacity=5_000)
+    for start in range(0, len(y_true), 4096):
+        sample.add(y_true[start:start + 4096], scores[start:start + 4096])
+        assert sample._buffered <= 2 * 5_000 + 4096
+    y_sample, s_sample = sample.rows()
+
+    assert len(y_sample) == 5_000 and sample.sampled
+    assert roc_auc(y_sample, s_sample, sample.labels) == pytest.approx(
+        sklearn_metrics.roc_auc_score(y_true, scores), abs=0.02
+    )
+
+
+def test_score_sample_keeps_every_row_below_capacity():
+    sample = ScoreSample(capacity=100)
+    sample.add([0, 1, 1], [0.2, 0.7, 0.9])
+    sample.add([0], [0.1])
+    y_sample, s_sample = sample.rows()
+    assert sorted(zip(y_sample.tolist(), s_sample.tolist())) == sorted(
+        zip([0, 1, 1, 0], np.float32([0.2, 0.7, 0.9, 0.1]).tolist())
+    )
+    assert not sample.sampled
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException, Response
+
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    finish_page,
+    keyset_match,
+    projection,
+    sort_spec,
+)
+
+
+def _page(limit=2, cursor=None):
+    return Page(limit=limit, cursor=cursor)
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2024, 5, 1, 12, 30, 15, 123000),
+    "ml_hackathon",
+    42,
+    None,
+])
+def test_cursor_round_trip(value):
+    oid = ObjectId()
+    value_back, oid_back = decode_cursor(encode_cursor({"_id": oid, "submitted_at": value}, "submitted_at"))
+    assert value_back == value and oid_back == oid
+
+
+def test_id_cursor_round_trip():
+    oid = ObjectId()
+    assert decode_cursor(encode_cursor({"_id": oid}, "_id")) == (None, oid)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "eyJ2IjoxLCJpZCI6Inh5eiJ9", "!!!"])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_match_after_cursor():
+    oid, when = ObjectId(), datetime(2024, 1, 1)
+    page = _page(cursor=encode_cursor({"_id": oid, "submitted_at": when}, "submitted_at"))
+    assert keyset_match(page, "submitted_at", descending=True) == {"$or": [
+        {"submitted_at": {"$lt": when}},
+        {"submitted_at": when, "_id": {"$lt": oid}},
+    ]}
+    assert keyset_match(_page(cursor=encode_cursor({"_id": oid}, "_id"))) == {"_id": {"$gt": oid}}
+    assert keyset_match(_page()) == {}
+
+
+def test_sort_spec_breaks_ties_on_id():
+    assert sort_spec("submitted_at", descending=True) == [("submitted_at", -1), ("_id", -1)]
+    assert sort_spec() == [("_id", 1)]
+
+
+def _matches(doc, query):
+    """Tiny evaluator for the queries keyset_match builds."""
+    if not query:
+        return True
+    if "$or" in query:
+        return any(_matches(doc, q) for q in query["$or"])
+    for field, cond in query.items():
+        if isinstance(cond, dict):
+            (op, value), = cond.items()
+            if not (doc[field] < value if op == "$lt" else doc[field] > value):
+                return False
+        elif doc[field] != cond:
+            return False
+    return True
+
+
+def test_walking_all_pages_returns_every_document_once():
+    base = datetime(2024, 1, 1)
+    # Several documents share a timestamp, so the _id tie-break matters
+    docs = [{"_id": ObjectId(), "submitted_at": base + timedelta(minutes=i // 3)} for i in range(11)]
+    ordered = sorted(docs, key=lambda d: (d["submitted_at"], d["_id"]), reverse=True)
+
+    seen, cursor = [], None
+    while True:
+        page = _page(limit=4, cursor=cursor)
+        query = keyset_match(page, "submitted_at", descending=True)
+        batch = [d for d in ordered if _matches(d, query)][:page.limit + 1]
+        response = Response()
+        seen += finish_page(batch, page, response, "submitted_at")
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    assert [d["_id"] for d in seen] == [d["_id"] for d in ordered]
+
+
+def test_last_page_has_no_cursor():
+    response = Response()
+    docs = [{"_id": ObjectId()}, {"_id": ObjectId()}]
+    assert finish_page(docs, _page(limit=2), response) == docs
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_projection_allows_only_known_fields():
+    assert projection(None, {"name"}) is None
+    assert projection("name, description", {"name", "description"}) == {"name": 1, "description": 1}
+    with pytest.raises(HTTPException):
+        projection("name,password", {"name"})
@@ -0,0 +1,96 @@
+import io
+
+import pytest
+
+from app.services.pitch_scoring import DeckError, DeckTooLarge, extract_text_from_ppt
+
+pptx = pytest.importorskip("pptx")
+from pptx.util import Inches  # noqa: E402
+
+
+def _python_pptx_text(buffer):
+    """What the endpoint returned when it parsed decks with python-pptx."""
+    buffer.seek(0)
+    prs = pptx.Presentation(buffer)
+    all_text = []
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and shape.text.strip():
+                all_text.append(shape.text.strip())
+    return len(prs.slides), " ".join(all_text)
+
+
+def _save(prs):
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def _sample_deck():
+    prs = pptx.Presentation()
+
+    title = prs.slides.add_slide(prs.slide_layouts[0])
+    title.shapes.title.text = "Problem: judges drown in decks"
+    title.placeholders[1].text = "Team Nextech — ünïcode ✓"
+
+    bullets = prs.slides.add_slide(prs.slide_layouts[1])
+    bullets.shapes.title.text = "Our solution"
+    body = bullets.placeholders[1].text_frame
+    body.text = "First point"
+    para = body.add_paragraph()
+    para.text = "Second point\vwith a line break"
+    body.add_paragraph().text = "   "
+    bullets.notes_slide.notes_text_frame.text = "Speaker notes are not part of the deck text"
+
+    blank = prs.slides.add_slide(prs.slide_layouts[6])
+    box = blank.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+    box.text_frame.text = "Tech stack: ONNX, FastAPI"
+    # Tables and groups expose no .text in python-pptx, so their text is not scored
+    table = blank.shapes.add_table(2, 2, Inches(1), Inches(3), Inches(4), Inches(1)).table
+    table.cell(0, 0).text = "table cell"
+    group = blank.shapes.add_group_shape()
+    group.shapes.add_textbox(Inches(5), Inches(1), Inches(2), Inches(1)).text_frame.text = "grouped text"
+    blank.shapes.add_shape(1, Inches(1), Inches(5), Inches(1), Inches(1))   # autoshape without text
+
+    prs.slides.add_slide(prs.slide_layouts[6])   # empty slide still counts
+    return prs
+
+
+def test_matches_python_pptx_on_sample_deck():
+    buffer = _save(_sample_deck())
+    expected = _python_pptx_text(buffer)
+    buffer.seek(0)
+    assert extract_text_from_ppt(buffer) == expected
+    assert "table cell" not in expected[1] and "grouped text" not in expected[1]
+
+
+def test_matches_python_pptx_when_slides_are_reordered():
+    prs = _sample_deck()
+    slide_ids = prs.slides._sldIdLst
+    first = slide_ids[0]
+    slide_ids.remove(first)
+    slide_ids.append(first)
+    buffer = _save(prs)
+    expected = _python_pptx_text(buffer)
+    buffer.seek(0)
+    assert extract_text_from_ppt(buffer) == expected
+    assert expected[1].startswith("Our solution")
+
+
+def test_reads_from_a_path(tmp_path):
+    path = tmp_path / "deck.pptx"
+    path.write_bytes(_save(_sample_deck()).getvalue())
+    assert extract_text_from_ppt(str(path)) == _python_pptx_text(io.BytesIO(path.read_bytes()))
+
+
+def test_rejects_files_that_are_not_decks():
+    with pytest.raises(DeckError):
+        extract_text_from_ppt(io.BytesIO(b"not a zip"))
+
+
+def test_rejects_oversized_decks(monkeypatch):
+    from app.services import pitch_scoring
+    monkeypatch.setattr(pitch_scoring, "MAX_PPT_UPLOAD_BYTES", 10)
+    with pytest.raises(DeckTooLarge):
+        extract_text_from_ppt(_save(_sample_deck()))
@@ -0,0 +1,28 @@
+import re
+
+import pytest
+
+from app.services.pitch_keywords import KEYWORD_GROUPS, find_keywords, keyword_features
+
+
+def _one_search_per_group(text):
+    """The original extraction: one re.search per keyword group."""
+    return {group["name"] for group in KEYWORD_GROUPS if re.search(group["pattern"], text, re.I)}
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "nextech",
+    "Problem and SOLUTION",
+    "our technology stack; next steps: a working prototype",
+    "stackproblemsolutiondemofuture",
+    "no keywords at all here",
+    "Scope\nDemo day",
+])
+def test_matches_one_search_per_group(text):
+    assert find_keywords(text) == _one_search_per_group(text)
+
+
+def test_overlapping_keywords_are_all_found():
+    assert find_keywords("nextech") == {"future", "tech"}
+    assert keyword_features(find_keywords("nextech")) == [0, 0, 1, 1, 0]
@@ -1,9 +1,9 @@
 import React, { useEffect, useState } from "react";
-import axios from "axios";
 import { motion, AnimatePresence } from "framer-motion";
 import { Calendar, Code2, Cpu, Rocket, Clock, Activity, Loader, AlertCircle, Filter } from "lucide-react";
 import { jwtDecode } from "jwt-decode";
 import { useNavigate } from "react-router-dom";
+import { fetchAllPages } from "../../utils/fetchAllPages";
 import "./Hackathons.css";
 
 const Hackathons = () => {
@@ -28,9 +28,9 @@ const Hackathons = () => {
 
     const fetchHackathons = async () => {
       try {
-        const res = await axios.get("http://localhost:8000/hackathon/active");
-        setHackathons(res.data);
-        setFiltered(res.data);
+        const active = await fetchAllPages("http://localhost:8000/hackathon/active");
+        setHackathons(active);
+        setFiltered(active);
       } catch (err) {
         console.error("Error fetching hackathons:", err);
         setError("Failed to load hackathons. Please try again later.");
@@ -12,6 +12,7 @@ import {
   BarChart3,
   Brain,
 } from "lucide-react";
+import { fetchAllPages } from "../../utils/fetchAllPages";
 import "./JudgeDash.css";
 
 const TeamCard = ({ submission, onEvaluate }) => {
@@ -159,11 +160,12 @@ const JudgeDash = () => {
   useEffect(() => {
     const fetchSubmissions = async () => {
       try {
-        const res = await axios.get("http://localhost:8000/judge/assigned", {
+        // Stats cover every assigned submission, so load all pages
+        const assigned = await fetchAllPages("http://localhost:8000/judge/assigned", {
           headers: { Authorization: `Bearer ${token}` },
         });
-        setSubmissions(res.data);
-        setFiltered(res.data);
+        setSubmissions(assigned);
+        setFiltered(assigned);
       } catch (err) {
         console.error("Error fetching submissions:", err);
       } finally {
@@ -175,16 +177,36 @@ const JudgeDash = () => {
 
   const handleEvaluate = async (submission) => {
     try {
-      const res = await axios.post(
+      await axios.post(
         `http://localhost:8000/judge/evaluate/${submission._id}`,
         {},
         { headers: { Authorization: `Bearer ${token}` } }
       );
+      setSubmissions((prev) =>
+        prev.map((s) =>
+          s._id === submission._id ? { ...s, status: "evaluating" } : s
+        )
+      );
+
+      // Evaluation runs in the background; poll until the pipeline finishes
+      let progress;
+      do {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const res = await axios.get(
+          `http://localhost:8000/judge/evaluate/${submission._id}/progress`,
+          { headers: { Authorization: `Bearer ${token}` } }
+        );
+        progress = res.data;
+      } while (["queued", "running"].includes(progress.evaluation_pipeline.status));
+
+      if (progress.evaluation_pipeline.status !== "finished") {
+        throw new Error(progress.evaluation_pipeline.error);
+      }
       alert("✅ Evaluation complete!");
       setSubmissions((prev) =>
         prev.map((s) =>
           s._id === submission._id
-            ? { ...s, status: "evaluated", evaluation_result: res.data.result }
+            ? { ...s, status: "evaluated", evaluation_result: progress.result }
             : s
         )
       );
@@ -26,15 +26,9 @@ const ParticipantDash = () => {
           }),
         ]);
 
-        const uniqueHacks = await Promise.all(
-          subsRes.data.map(async (sub) => {
-            const hack = await axios.get(`${API_BASE}/hackathon/${sub._id}`);
-            return { ...hack.data, submission: sub };
-          })
-        );
-
+        // Each hackathon already carries the participant's submission
         setUser(userRes.data);
-        setHackathons(uniqueHacks);
+        setHackathons(subsRes.data);
       } catch (err) {
         console.error("Failed to fetch participant data:", err);
       } finally {
@@ -0,0 +1,22 @@
+import axios from "axios";
+
+/**
+ * Fetches every page of a paginated list endpoint.
+ * The backend returns one page per request and the next page's cursor in the
+ * X-Next-Cursor header (absent on the last page).
+ * @param {string} url - list endpoint
+ * @param {object} config - axios config (headers, params, ...)
+ */
+export const fetchAllPages = async (url, config = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const res = await axios.get(url, {
+      ...config,
+      params: { ...config.params, limit: 200, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...res.data);
+    cursor = res.headers["x-next-cursor"];
+  } while (cursor);
+  return items;
+};